@@ -2,3 +2,14 @@
 App package for 3D Pore Visualization System
 Contains modular visualization components.
 """
+
+import matplotlib
+
+# All figures are written straight to image files, so use the non-interactive
+# Agg backend and let it simplify paths and chunk large draws
+matplotlib.use('Agg')
+matplotlib.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
@@ -6,26 +6,33 @@ Generates detailed statistical visualizations of pore properties including
 3D distribution with volume-based coloring and diameter/sphericity histograms.
 """
 
+import logging
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 from matplotlib.cm import ScalarMappable
 from matplotlib.colors import Normalize
 import os
-from tqdm import tqdm
 from . import config
-from .utils import setup_clean_axes, generate_realistic_pores, plot_orange_prism_frame
+from .utils import (setup_clean_axes, generate_realistic_pores, plot_orange_prism_frame,
+                    get_unit_sphere_mesh, render_particle_fill,
+                    deadline)
 import matplotlib.lines as mlines
 
+logger = logging.getLogger(__name__)
 
-def calculate_pore_properties(positions, radii):
+
+def calculate_pore_properties(positions, radii, rng=None):
     """Calculate advanced properties of pores including volume and sphericity."""
+    if rng is None:
+        rng = np.random.default_rng()
+
     # Calculate volumes (4/3 * pi * r^3)
     volumes = (4/3) * np.pi * (radii**3)
 
     # Generate simulated sphericity values (normally ~0.6-0.7 with some variation)
     # In a real implementation, this would be calculated from actual pore shapes
-    sphericity = 0.65 + 0.05 * np.random.randn(len(radii))
+    sphericity = 0.65 + 0.05 * rng.standard_normal(len(radii))
     sphericity = np.clip(sphericity, 0.1, 1.0)
 
     # Convert radii to equivalent diameters (2*r)
@@ -34,19 +41,22 @@ def calculate_pore_properties(positions, radii):
     return volumes, sphericity, diameters
 
 
-def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
+def create_advanced_pore_analysis(diam, intr, sample_name, output_file, pore_diameters=None,
+                                  rng=None):
     """Create advanced pore analysis visualization with statistical distributions."""
     # Get configuration
     current_config = config.get_config()
+    if rng is None:
+        rng = np.random.default_rng(current_config.random_seed)
 
     # Generate pore data
     pore_positions, scaled_radii, _ = generate_realistic_pores(
         # Use more pores for statistical significance
-        diam, intr, sample_name, n_pores=800)
+        diam, intr, sample_name, n_pores=800, selected_diameters=pore_diameters, rng=rng)
 
     # Calculate pore properties
     volumes, sphericity, diameters = calculate_pore_properties(
-        pore_positions, scaled_radii)
+        pore_positions, scaled_radii, rng)
 
     # Create figure with grid layout (3D view on top, histogram below)
     fig = plt.figure(figsize=(10, 12))
@@ -64,83 +74,21 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
     plot_orange_prism_frame(ax1)
 
     # Add matrix fill to match the style of pores_matrix_combined visualizations
-    matrix_params = current_config.get_matrix_parameters()
     dimension_scales = current_config.get_dimension_scale_factors()
     particle_counts = current_config.get_particle_counts()
 
-    x_min, x_max = matrix_params['x_bounds']
-    y_min, y_max = matrix_params['y_bounds']
-    z_min, z_max = matrix_params['z_bounds']
-    length_norm = matrix_params['length_norm']
-    width_norm = matrix_params['width_norm']
-
     # Generate matrix particles similar to hybrid_pore_matrix_modeling.py
     total_porosity = np.sum(intr)
     base_particles = int(
         particle_counts['hybrid_main'] * dimension_scales['volume_scale'])
     sand_particle_count = int(base_particles * (1 + total_porosity / 10))
 
-    # Generate sand particle coordinates
-    x_sand = np.random.uniform(x_min, x_max, sand_particle_count)
-    y_sand = np.random.uniform(y_min, y_max, sand_particle_count)
-    z_sand = np.random.uniform(z_min, z_max, sand_particle_count)
-
-    # Create particle characteristics based on intrusion data
-    norm_intrusion = intr / np.max(intr)
-
-    # Generate sand particle properties
-    sand_sizes = []
-    sand_colors = []
-
     # Use a sample-specific colormap as in the original implementation
     sample_colormaps = {'T1': 'Reds', 'T2': 'Blues', 'T3': 'Oranges'}
     colormap = plt.get_cmap(sample_colormaps.get(sample_name, 'viridis'))
 
-    for j in range(sand_particle_count):
-        # Map particle position to intrusion characteristics
-        dist_x_norm = abs(x_sand[j]) / length_norm
-        dist_y_norm = abs(y_sand[j]) / width_norm
-        dist_from_center = np.sqrt((dist_x_norm**2 + dist_y_norm**2) / 2)
-
-        # Map to intrusion data
-        data_idx = min(int(dist_from_center * len(intr)), len(intr)-1)
-
-        # Particle size based on pore characteristics
-        base_size = matrix_params['base_particle_size'] + \
-            matrix_params['particle_size_variation'] * norm_intrusion[data_idx]
-        size_variation = np.random.uniform(0.7, 1.3)
-        final_size = base_size * size_variation
-        sand_sizes.append(final_size)
-
-        # Color intensity (using matrix parameters)
-        color_intensity = matrix_params['color_intensity_base'] + \
-            matrix_params['color_intensity_variation'] * \
-            norm_intrusion[data_idx]
-        sand_colors.append(colormap(color_intensity))
-
-    # Sort sand particles by depth for proper rendering
-    sand_distances = np.sqrt(x_sand**2 + y_sand**2 + z_sand**2)
-    sand_sort_indices = np.argsort(-sand_distances)
-
-    # Apply sorting
-    x_sand_sorted = x_sand[sand_sort_indices]
-    y_sand_sorted = y_sand[sand_sort_indices]
-    z_sand_sorted = z_sand[sand_sort_indices]
-    sizes_sand_sorted = np.array(sand_sizes)[sand_sort_indices]
-    colors_sand_sorted = np.array(sand_colors)[sand_sort_indices]
-
     # Render sand particles with high visibility
-    batch_size = matrix_params['batch_size']
-    for batch_start in range(0, len(x_sand_sorted), batch_size):
-        batch_end = min(batch_start + batch_size, len(x_sand_sorted))
-
-        ax1.scatter(x_sand_sorted[batch_start:batch_end],
-                    y_sand_sorted[batch_start:batch_end],
-                    z_sand_sorted[batch_start:batch_end],
-                    s=sizes_sand_sorted[batch_start:batch_end],
-                    c=colors_sand_sorted[batch_start:batch_end],
-                    alpha=matrix_params['particle_alpha'],
-                    edgecolors='none')
+    render_particle_fill(ax1, intr, sand_particle_count, colormap, rng)
 
     # Calculate average porosity for title
     total_volume = (current_config.board_length_mm/1000) * \
@@ -165,8 +113,8 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
     camera_pos = np.array([3.0, 1.0, 1.0])
 
     # Sort pores by distance from camera for proper rendering
-    distances = np.linalg.norm(
-        pore_positions - camera_pos.reshape(1, 3), axis=1)
+    camera_offsets = pore_positions - camera_pos
+    distances = np.sqrt(np.einsum('ij,ij->i', camera_offsets, camera_offsets))
     z_bonus = pore_positions[:, 2] / 0.4 * 0.2 * np.max(distances)
     adjusted_distances = distances - z_bonus
 
@@ -186,8 +134,8 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
         micropore_color = sample_color
         mesopore_color = sample_color
         macropore_color = sample_color
-        print(
-            f"[DEBUG] Advanced analysis using sample-specific color for {sample_name}: {sample_color}")
+        logger.debug(
+            f"Advanced analysis using sample-specific color for {sample_name}: {sample_color}")
     else:
         # Use default size-based colors
         micropore_color = pore_colors["micropore_color"]
@@ -203,8 +151,11 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
     micropore_max = min_radius + radius_range * 0.33
     mesopore_max = min_radius + radius_range * 0.66
 
+    # Shared unit sphere mesh for every pore
+    unit_x, unit_y, unit_z = get_unit_sphere_mesh(12, 8)
+
     # Render pores using the same techniques as in hybrid_pore_matrix_modeling.py
-    print(
+    logger.info(
         f"Rendering {len(pore_positions)} pores for analysis of {sample_name}...")
     for i in range(len(pore_positions)):
         radius = scaled_radii[i]
@@ -222,16 +173,13 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
                 color = macropore_color
 
         # Create a sphere for each pore
-        u = np.linspace(0, 2 * np.pi, 12)
-        v = np.linspace(0, np.pi, 8)
-        x = pore_positions[i, 0] + radius * np.outer(np.cos(u), np.sin(v))
-        y = pore_positions[i, 1] + radius * np.outer(np.sin(u), np.sin(v))
-        z = pore_positions[i, 2] + radius * \
-            np.outer(np.ones(np.size(u)), np.cos(v))
+        x = pore_positions[i, 0] + radius * unit_x
+        y = pore_positions[i, 1] + radius * unit_y
+        z = pore_positions[i, 2] + radius * unit_z
 
         # Plot with same settings as hybrid visualization
         ax1.plot_surface(x, y, z, color=color, shade=True, alpha=1.0,
-                         rstride=1, cstride=1, linewidth=0)
+                         rstride=1, cstride=1, linewidth=0, rasterized=True)
 
     # Get advanced visualization parameters from config
     advanced_params = current_config.get_advanced_analysis_params()
@@ -256,8 +204,8 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
         volume_sm = ScalarMappable(cmap=custom_cmap, norm=volume_norm)
         volume_sm.set_array([])
 
-        print(
-            f"[DEBUG] Using smooth gradient colorbar with colors: {custom_colors}")
+        logger.debug(
+            f"Using smooth gradient colorbar with colors: {custom_colors}")
     else:
         # Use 'jet' colormap for vibrant, distinct colors (original behavior)
         volume_norm = Normalize(vmin=0, vmax=volumes.max())
@@ -330,7 +278,7 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
     sorted_sphericity = sphericity[sorted_indices]
 
     # Add jitter to points to avoid vertical alignment
-    jitter = np.random.uniform(-1.5, 1.5, len(sorted_diameters))
+    jitter = rng.uniform(-1.5, 1.5, len(sorted_diameters))
     jittered_diameters = sorted_diameters + jitter
 
     # Plot sphericity scatter with jitter
@@ -356,6 +304,61 @@ def create_advanced_pore_analysis(diam, intr, sample_name, output_file):
     # plt.tight_layout()
 
     # Save figure
-    plt.savefig(output_file, dpi=current_config.dpi, bbox_inches='tight')
-    print(f"Advanced pore analysis saved to {output_file}")
+    plt.savefig(output_file, **current_config.get_savefig_options())
+    logger.info(f"Advanced pore analysis saved to {output_file}")
     plt.close()
+
+
+def render_advanced_sample(diam, intr, sample_name, output_file, rng=None, version=None,
+                           timeout=120):
+    """
+    Render one sample's advanced analysis figure with timeout protection.
+
+    Used by the advanced wrapper scripts, which dispatch one call per sample
+    through run_parallel_jobs; a failed or timed-out render is reported and
+    skipped rather than raised.
+
+    Parameters:
+    -----------
+    diam, intr : array-like
+        Diameter and intrusion data for the sample
+    sample_name : str
+        Name of the sample
+    output_file : str
+        Path to save the figure
+    rng : numpy.random.Generator, optional
+        Random generator for pore sampling; callers running several samples
+        pass each one its own spawn_rngs child (defaults to one seeded from
+        the configured random seed)
+    version : str, optional
+        Analysis variant shown in the progress messages (e.g. "v2")
+    timeout : int
+        Seconds allowed for the render
+
+    Returns:
+    --------
+    bool
+        True if the figure was saved
+    """
+    analysis = f"advanced analysis {version}" if version else "advanced analysis"
+
+    logger.debug(f"Creating {analysis} for {sample_name}")
+    logger.debug(f"Data shapes - diam: {len(diam)}, intr: {len(intr)}")
+
+    # Create the advanced analysis with timeout protection
+    try:
+        logger.debug(f"Starting {analysis} rendering for {sample_name}...")
+        with deadline(timeout):
+            create_advanced_pore_analysis(diam, intr, sample_name, output_file, rng=rng)
+
+    except TimeoutError:
+        logger.warning(
+            f"{analysis.capitalize()} for {sample_name} timed out, skipping")
+        return False
+    except Exception as rendering_error:
+        logger.warning(
+            f"{analysis.capitalize()} rendering failed for {sample_name}: {rendering_error}")
+        return False
+
+    logger.info(f"{analysis.capitalize()} saved: {output_file}")
+    return True
@@ -7,12 +7,17 @@ characteristics across different board compositions (T1, T2, T3) to evaluate
 the effects of agricultural waste additives on pore structure.
 """
 
+import logging
+import numpy as np
 import matplotlib.pyplot as plt
 from .individual_board_modeling import create_clean_pore_visualization
 from .config import get_config
 
+logger = logging.getLogger(__name__)
 
-def create_combined_three_samples_visualization(diam1, intr1, diam2, intr2, diam3, intr3, output_file):
+
+def create_combined_three_samples_visualization(diam1, intr1, diam2, intr2, diam3, intr3, output_file,
+                                                pore_diameters=(None, None, None), rng=None):
     """
     Create comparative analysis visualization of all three board compositions.
 
@@ -28,8 +33,16 @@ def create_combined_three_samples_visualization(diam1, intr1, diam2, intr2, diam
         Mercury intrusion volume data for each composition
     output_file : str
         Path for saving the comparative analysis visualization
+    pore_diameters : tuple, optional
+        Pre-sampled pore diameters for T1, T2 and T3 (None entries are
+        sampled from the MIP data)
+    rng : numpy.random.Generator, optional
+        Random generator shared by the three panels (defaults to one seeded
+        from the configured random seed)
     """
     config = get_config()
+    if rng is None:
+        rng = np.random.default_rng(config.random_seed)
 
     # Create figure with adjusted size for three-panel comparison
     fig = plt.figure(figsize=(18, 7))
@@ -47,12 +60,12 @@ def create_combined_three_samples_visualization(diam1, intr1, diam2, intr2, diam
     ]
 
     # Create visualizations for each sample with different color schemes
-    create_clean_pore_visualization(ax1, diam1, intr1, "T1", 'Blues')
-    create_clean_pore_visualization(ax2, diam2, intr2, "T2", 'Greens')
-    create_clean_pore_visualization(ax3, diam3, intr3, "T3", 'Oranges')
+    create_clean_pore_visualization(ax1, diam1, intr1, "T1", 'Blues', pore_diameters[0], rng)
+    create_clean_pore_visualization(ax2, diam2, intr2, "T2", 'Greens', pore_diameters[1], rng)
+    create_clean_pore_visualization(ax3, diam3, intr3, "T3", 'Oranges', pore_diameters[2], rng)
 
     plt.tight_layout()
-    plt.savefig(output_file, dpi=config.dpi, bbox_inches='tight',
-                format=config.output_format)
-    print(f"Combined visualization saved to {output_file}")
+    plt.savefig(output_file, format=config.output_format,
+                **config.get_savefig_options())
+    logger.info(f"Combined visualization saved to {output_file}")
     plt.close()
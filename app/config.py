@@ -8,9 +8,13 @@ to enable easy switching between different experimental configurations
 without modifying core analysis code.
 """
 
+import logging
+from functools import lru_cache
 from typing import Dict, Any
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 # Default color settings for different pore types
 # Even more intense colors that will be clearly visible against matrix
@@ -18,6 +22,33 @@ DEFAULT_MICROPORE_COLOR = "#FF1493"  # Deep pink (Micropores)
 DEFAULT_MESOPORE_COLOR = "#FFFF00"   # Bright yellow (Mesopores)
 DEFAULT_MACROPORE_COLOR = "#00FFFF"  # Bright cyan (Macropores)
 
+# Edge connectivity of the board wireframe (vertex index pairs)
+BOARD_EDGES = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 0),  # Bottom face
+    (4, 5), (5, 6), (6, 7), (7, 4),  # Top face
+    (0, 4), (1, 5), (2, 6), (3, 7)   # Connecting edges
+], dtype=np.intp)
+BOARD_EDGES.setflags(write=False)
+
+
+@lru_cache(maxsize=8)
+def board_corners(length_scale, width_scale, thickness_scale):
+    """
+    Build the read-only (8, 3) corner array for the given half extents.
+    """
+    corners = np.array([
+        [-length_scale, -width_scale, -thickness_scale],
+        [length_scale, -width_scale, -thickness_scale],
+        [length_scale, width_scale, -thickness_scale],
+        [-length_scale, width_scale, -thickness_scale],
+        [-length_scale, -width_scale, thickness_scale],
+        [length_scale, -width_scale, thickness_scale],
+        [length_scale, width_scale, thickness_scale],
+        [-length_scale, width_scale, thickness_scale]
+    ])
+    corners.setflags(write=False)
+    return corners
+
 
 class MaterialConfig:
     """
@@ -42,6 +73,9 @@ class MaterialConfig:
         self.macropore_color = DEFAULT_MACROPORE_COLOR
         self.matrix_fill_color = "#cccccc"  # Default matrix fill color
         self.enable_advanced_analysis = False  # Disabled by default
+        self.parallel_rendering = True  # Render independent figures in worker processes
+        self.random_seed = None  # Seed for pore and particle sampling (None = fresh entropy)
+        self.png_compress_level = 1  # zlib level for PNG output (PIL default is 6)
         self._load_configuration(config_name)
 
     def _load_configuration(self, config_name: str):
@@ -365,19 +399,12 @@ class MaterialConfig:
         Returns:
         --------
         numpy.ndarray
-            Array of shape (8, 3) containing corner coordinates
+            Read-only array of shape (8, 3) containing corner coordinates
         """
-        corners = np.array([
-            [-self.length_scale, -self.width_scale, -self.thickness_scale],
-            [self.length_scale, -self.width_scale, -self.thickness_scale],
-            [self.length_scale, self.width_scale, -self.thickness_scale],
-            [-self.length_scale, self.width_scale, -self.thickness_scale],
-            [-self.length_scale, -self.width_scale, self.thickness_scale],
-            [self.length_scale, -self.width_scale, self.thickness_scale],
-            [self.length_scale, self.width_scale, self.thickness_scale],
-            [-self.length_scale, self.width_scale, self.thickness_scale]
-        ])
-        return corners
+        # Corners only depend on the board half extents, so they are built
+        # once per geometry and shared (read-only) across calls
+        return board_corners(self.length_scale, self.width_scale,
+                             self.thickness_scale)
 
     def get_board_edges(self):
         """
@@ -385,15 +412,10 @@ class MaterialConfig:
 
         Returns:
         --------
-        list
-            List of tuples defining edge connections between vertices
+        numpy.ndarray
+            Read-only array of shape (12, 2) with vertex indices of each edge
         """
-        edges = [
-            (0, 1), (1, 2), (2, 3), (3, 0),  # Bottom face
-            (4, 5), (5, 6), (6, 7), (7, 4),  # Top face
-            (0, 4), (1, 5), (2, 6), (3, 7)   # Connecting edges
-        ]
-        return edges
+        return BOARD_EDGES
 
     def is_point_inside_board(self, x, y, z):
         """
@@ -457,6 +479,13 @@ class MaterialConfig:
             'pore_color_intensity_variation': self.pore_color_intensity_variation
         }
 
+    def get_savefig_options(self):
+        """Get keyword arguments shared by every savefig call."""
+        options = {'dpi': self.dpi, 'bbox_inches': 'tight'}
+        if self.output_format == 'png':
+            options['pil_kwargs'] = {'compress_level': self.png_compress_level}
+        return options
+
     def get_normalized_bounds(self):
         """Get normalized coordinate bounds for visualizations."""
         return {
@@ -569,7 +598,7 @@ class MaterialConfig:
 CONFIG = MaterialConfig("default")
 
 
-def set_configuration(config_name: str):
+def set_configuration(config_name: str, config_class=None):
     """
     Switch to a different configuration.
 
@@ -577,13 +606,24 @@ def set_configuration(config_name: str):
     -----------
     config_name : str
         Configuration to switch to ('default', 'small_specimen')
+    config_class : type, optional
+        MaterialConfig subclass to instantiate. Defaults to the class of the
+        current configuration, so a subclass installed by a wrapper script
+        survives later switches made by main().
     """
     global CONFIG
-    CONFIG = MaterialConfig(config_name)
-    print(f"Switched to configuration: {config_name}")
-    print("Configuration summary:")
+    if config_class is None:
+        config_class = type(CONFIG)
+    CONFIG = config_class(config_name)
+    logger.info(f"Switched to configuration: {config_name}")
+    log_configuration_summary()
+
+
+def log_configuration_summary():
+    """Log the key parameters of the current configuration."""
+    logger.info("Configuration summary:")
     for key, value in CONFIG.get_summary().items():
-        print(f"  {key}: {value}")
+        logger.info(f"  {key}: {value}")
 
 
 def get_config():
@@ -7,12 +7,26 @@ This module handles experimental data loading, cleaning, and preparation
 for 3D pore structure modeling and computational analysis.
 """
 
+import logging
+import os
 import pandas as pd
 import numpy as np
-from io import StringIO
 
+logger = logging.getLogger(__name__)
 
-def load_and_clean_data(filename):
+# Board identifiers in the order their columns appear in the MIP data file
+BOARD_NAMES = ("T1", "T2", "T3")
+
+# Column names of the headerless MIP data rows, in file order
+COLUMN_NAMES = tuple(f"{quantity}_{name}" for name in BOARD_NAMES
+                     for quantity in ("diam", "int", "cond"))
+
+# Columns used for pore modeling (the conductivity columns are not)
+PORE_COLUMNS = tuple(f"{quantity}_{name}" for name in BOARD_NAMES
+                     for quantity in ("diam", "int"))
+
+
+def load_and_clean_data(filename, columns=None):
     """
     Load and process experimental mercury intrusion porosimetry data.
 
@@ -24,6 +38,9 @@ def load_and_clean_data(filename):
     -----------
     filename : str
         Path to CSV file containing experimental MIP data
+    columns : list of str, optional
+        Subset of COLUMN_NAMES to parse; other columns are skipped by the
+        CSV reader (defaults to all columns)
 
     Returns:
     --------
@@ -31,46 +48,82 @@ def load_and_clean_data(filename):
         Cleaned experimental data with validated numerical values
         for pore diameter, intrusion volume, and thermal conductivity
     """
-    print("Loading and cleaning experimental MIP data...")
-
-    # Read experimental data file line by line
-    with open(filename, 'r') as f:
-        all_lines = f.readlines()
-
-    # Filter data rows to ensure valid numerical entries for analysis
-    clean_lines = []
-    for line in all_lines:
-        stripped = line.strip()
-        if stripped == "":
-            continue
-        first_token = stripped.split(',')[0]
-        try:
-            _ = float(first_token)
-            clean_lines.append(line)
-        except ValueError:
-            continue
-
-    # Join clean lines and parse with pandas
-    csv_data = "".join(clean_lines)
-    df = pd.read_csv(StringIO(csv_data), header=None)
-
-    # Assign column names
-    df.columns = [
-        "diam_T1", "int_T1", "cond_T1",
-        "diam_T2", "int_T2", "cond_T2",
-        "diam_T3", "int_T3", "cond_T3"
-    ]
-
-    # Force everything to numeric and drop any leftover NaNs
+    logger.info("Loading and cleaning experimental MIP data...")
+
+    # Parse the file directly; header and label rows have no numeric first
+    # field and are removed with the other invalid rows below
+    df = pd.read_csv(filename, header=None, names=list(COLUMN_NAMES),
+                     usecols=columns, encoding='utf-8-sig')
+
+    # Force everything to numeric and drop rows that are not valid data
     for col in df.columns:
         df[col] = pd.to_numeric(df[col], errors='coerce')
-    df = df.dropna(subset=["diam_T1", "int_T1", "diam_T2",
-                   "int_T2", "diam_T3", "int_T3"])
+    df = df.dropna(subset=[col for col in PORE_COLUMNS if col in df.columns])
+    df = df.reset_index(drop=True)
 
     return df
 
 
 def sort_by_diameter(d_arr, v_arr):
     """Sort arrays by diameter values in ascending order"""
-    idx = np.argsort(d_arr)
+    idx = np.argsort(d_arr, kind="stable")
     return d_arr[idx], v_arr[idx]
+
+
+def load_board_data(filename):
+    """
+    Load the sorted (diameter, intrusion) arrays of every board.
+
+    Parsing the CSV file is the slow part of loading, so the sorted arrays
+    are cached in a ``.cache.npz`` sidecar next to the data file. The cache
+    is keyed by the data file's modification time and size and rebuilt
+    whenever either changes.
+
+    Parameters:
+    -----------
+    filename : str
+        Path to CSV file containing experimental MIP data
+
+    Returns:
+    --------
+    list of tuple or None
+        (diameters, intrusion) arrays sorted by diameter for boards T1, T2
+        and T3, or None if no valid data rows were found
+    """
+    stat = os.stat(filename)
+    cache_key = np.array([stat.st_mtime, stat.st_size], dtype=np.float64)
+    cache_path = os.path.splitext(filename)[0] + ".cache.npz"
+
+    # Reuse the cached arrays if the data file has not changed
+    try:
+        with np.load(cache_path) as cache:
+            if np.array_equal(cache["key"], cache_key):
+                logger.info("Loading cached experimental MIP data...")
+                return [(cache[f"diam_{name}"], cache[f"int_{name}"])
+                        for name in BOARD_NAMES]
+    except (OSError, KeyError, ValueError):
+        pass
+
+    df = load_and_clean_data(filename, columns=PORE_COLUMNS)
+    if df is None or df.empty:
+        return None
+
+    # Sort each board by diameter directly on the column arrays
+    boards = []
+    for name in BOARD_NAMES:
+        diam = df[f"diam_{name}"].to_numpy()
+        order = np.argsort(diam, kind="stable")
+        boards.append((diam[order], df[f"int_{name}"].to_numpy()[order]))
+
+    # Caching is best effort; a read-only data directory is not an error
+    arrays = {"key": cache_key}
+    for name, (diam, intr) in zip(BOARD_NAMES, boards):
+        arrays[f"diam_{name}"] = diam
+        arrays[f"int_{name}"] = intr
+    try:
+        np.savez(cache_path, **arrays)
+    except OSError:
+        pass
+
+    return boards
+
@@ -7,15 +7,22 @@ density and size distribution throughout the board thickness and cross-sectional
 area, based on experimental mercury intrusion porosimetry data.
 """
 
+import logging
 import numpy as np
 import matplotlib.pyplot as plt
 from tqdm import tqdm
-from .utils import plot_orange_prism_frame, setup_clean_axes
+from .utils import plot_orange_prism_frame, setup_clean_axes, PROGRESS_OPTIONS
 from .config import get_config
 
+logger = logging.getLogger(__name__)
 
-def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3, output_file):
+
+def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3, output_file,
+                                        rng=None):
     """Create visualization with realistic density fill inside orange prism frames"""
+    if rng is None:
+        rng = np.random.default_rng(get_config().random_seed)
+
     fig = plt.figure(figsize=(20, 8))
 
     # Create subplots
@@ -33,7 +40,7 @@ def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3
     for i, (ax, name, diameters, intrusion, cmap) in enumerate(zip(
             axes, sample_names, diameters_list, intrusion_list, cmaps)):
 
-        print(f"\nGenerating density fill for {name}...")
+        logger.info(f"\nGenerating density fill for {name}...")
 
         # Setup clean axes
         setup_clean_axes(ax)
@@ -55,7 +62,8 @@ def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3
         norm_intrusion = intrusion / np.max(intrusion)
 
         # Create a density profile that varies with height and radial distance
-        for layer_idx in tqdm(range(n_layers-1), desc=f"Creating {name} density layers"):
+        for layer_idx in tqdm(range(n_layers-1), desc=f"Creating {name} density layers",
+                              **PROGRESS_OPTIONS):
             z_bottom = layer_heights[layer_idx]
             z_top = layer_heights[layer_idx + 1]
             z_mid = (z_bottom + z_top) / 2
@@ -99,7 +107,7 @@ def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3
                     base_density = norm_intrusion[data_idx]
 
                     # Add height variation and some turbulence
-                    turbulence = 0.8 + 0.4 * np.random.random()
+                    turbulence = 0.8 + 0.4 * rng.random()
                     radial_factor = 1.0 - 0.3 * dist_from_center  # More dense toward center
 
                     final_density = base_density * height_factor * radial_factor * turbulence
@@ -142,7 +150,8 @@ def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3
                                    s=30 * density_masked[j],  # Adjusted size
                                    c=[colors_layer[j]],
                                    alpha=0.6,
-                                   edgecolors='none')
+                                   edgecolors='none',
+                                   rasterized=True)
 
         # Add sample label
         ax.text2D(0.05, 0.95, name, transform=ax.transAxes, fontsize=12,
@@ -150,6 +159,6 @@ def create_density_filled_visualization(diam1, intr1, diam2, intr2, diam3, intr3
 
     plt.tight_layout()
     config_instance = get_config()
-    plt.savefig(output_file, dpi=config_instance.dpi, bbox_inches='tight')
-    print(f"Density-filled visualization saved to {output_file}")
+    plt.savefig(output_file, **config_instance.get_savefig_options())
+    logger.info(f"Density-filled visualization saved to {output_file}")
     plt.close()
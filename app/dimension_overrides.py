@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Board dimension overrides shared by the wrapper scripts.
+
+The 100×100×100mm cube wrappers differ only in their visualization extras;
+the geometry, coordinate scaling and scaled pore/particle counts they apply
+on top of the default configuration live here, together with the single
+color per sample and legend blocking used by the color0 variants.
+"""
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Volume ratio of the 100×100×100mm cube to the default 160×160×40mm board
+VOLUME_RATIO = (100 * 100 * 100) / (160 * 160 * 40)  # About 0.98
+
+# Pore and particle counts scaled from the defaults, computed once at import
+SCALED_COUNTS = {
+    'n_pores_individual': int(600 * VOLUME_RATIO),
+    'n_pores_comparative': int(400 * VOLUME_RATIO),
+    'n_pores_density': int(500 * VOLUME_RATIO),
+    'n_pores_matrix': int(800 * VOLUME_RATIO),
+    'n_pores_hybrid': int(800 * VOLUME_RATIO),
+    'base_particles_matrix': int(15000 * VOLUME_RATIO),
+    'base_particles_hybrid_main': int(8000 * VOLUME_RATIO),
+    'base_particles_hybrid_combined': int(5000 * VOLUME_RATIO),
+}
+
+
+# Single pore color per sample, matching the combined visualization pattern
+SAMPLE_PORE_COLORS = {
+    'T1': "#D62728",  # Red for T1 (matches matrix fill color pattern)
+    'T2': "#1F77B4",  # Blue for T2 (matches matrix fill color pattern)
+    'T3': "#FF7F0E"   # Orange for T3 (matches matrix fill color pattern)
+}
+
+
+def apply_dim100_overrides(config):
+    """
+    Apply the 100×100×100mm cubic board geometry to a configuration.
+
+    Parameters:
+    -----------
+    config : MaterialConfig
+        Configuration with the default settings already loaded
+    """
+    # Board dimensions (changed from 160.0 × 160.0 × 40.0)
+    config.board_length_mm = 100.0
+    config.board_width_mm = 100.0
+    config.board_thickness_mm = 100.0
+
+    # Normalized coordinate scaling for the cubic shape (adjusted from 2.0,
+    # 2.0 and 0.5) with equal aspect ratio on all axes
+    config.length_scale = 1.25
+    config.width_scale = 1.25
+    config.thickness_scale = 1.25
+    config.aspect_ratio = [1, 1, 1]
+
+    # Visualization limits for the cubic shape
+    config.x_limits = (-1.5, 1.5)
+    config.y_limits = (-1.5, 1.5)
+    config.z_limits = (-1.5, 1.5)
+
+    # Matrix fill boundaries
+    config.matrix_fill_x_bounds = (-1.2, 1.2)
+    config.matrix_fill_y_bounds = (-1.2, 1.2)
+    config.matrix_fill_z_bounds = (-1.2, 1.2)
+
+    # Normalization constants for particle distribution (adjusted from 1.95)
+    config.matrix_length_norm = 1.2
+    config.matrix_width_norm = 1.2
+
+    # Default coordinate bounds for particle placement
+    config.default_x_bounds = (-1.2, 1.2)
+    config.default_y_bounds = (-1.2, 1.2)
+    config.default_z_bounds = (-1.2, 1.2)
+
+    # Camera at equal distance on every axis for the cubic view
+    config.camera_position = np.array([2.0, 2.0, 2.0])
+    config.view_elevation = 35
+    config.view_azimuth = 45
+
+    # Scale pore and particle counts to the cubic volume
+    config.__dict__.update(SCALED_COUNTS)
+
+
+def no_op_legend(*args, **kwargs):
+    return None
+
+
+def disable_legends():
+    """
+    Replace every matplotlib legend entry point with a no-op.
+
+    Blocking legend creation at the source means no legend ever reaches a
+    figure, so nothing has to sweep them away before a figure is saved.
+    """
+    plt.legend = no_op_legend
+    plt.figlegend = no_op_legend
+    matplotlib.axes.Axes.legend = no_op_legend
+    matplotlib.figure.Figure.legend = no_op_legend
@@ -7,17 +7,23 @@ surrounding matrix material, providing comprehensive representation of both
 macro-porosity and fine-scale material composition.
 """
 
+import logging
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
 from matplotlib.patches import Patch
 from tqdm import tqdm
-from .utils import plot_orange_prism_frame, setup_clean_axes, generate_realistic_pores
+from .utils import (plot_orange_prism_frame, setup_clean_axes, generate_realistic_pores,
+                    get_unit_sphere_mesh, render_particle_fill,
+                    PROGRESS_OPTIONS)
 from . import config
 
+logger = logging.getLogger(__name__)
+
 
 def create_combined_pores_matrix_visualization(
-    diam, intr, sample_name, output_file, sample_color='jet'
+    diam, intr, sample_name, output_file, sample_color='jet', pore_diameters=None,
+    rng=None
 ):
     """
     Create hybrid computational model combining discrete pores with matrix material.
@@ -38,11 +44,16 @@ def create_combined_pores_matrix_visualization(
         Path for saving the generated hybrid model
     sample_color : str, default='jet'
         Colormap for pore visualization
+    pore_diameters : array_like, optional
+        Pre-sampled pore diameters to use instead of drawing new ones
+    rng : numpy.random.Generator, optional
+        Random generator for pore and particle sampling (defaults to one
+        seeded from the configured random seed)
     """
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
 
-    print(f"\nCreating hybrid pore-matrix model for {sample_name}...")
+    logger.info(f"\nCreating hybrid pore-matrix model for {sample_name}...")
 
     # Setup clean axes
     setup_clean_axes(ax)
@@ -51,22 +62,16 @@ def create_combined_pores_matrix_visualization(
     plot_orange_prism_frame(ax)
 
     # 1. First, add sand/dust fill with high visibility
-    print(f"Adding sand/dust background for {sample_name}...")
+    logger.info(f"Adding sand/dust background for {sample_name}...")
 
-    # Get matrix parameters from configuration (same as matrix_material_modeling.py)
+    # Get particle parameters from configuration
     current_config = config.get_config()
-    matrix_params = current_config.get_matrix_parameters()
     dimension_scales = current_config.get_dimension_scale_factors()
     particle_counts = current_config.get_particle_counts()
     # Still needed for pore coloring
     size_params = current_config.get_particle_size_parameters()
-
-    # Use matrix parameters from configuration
-    x_min, x_max = matrix_params['x_bounds']
-    y_min, y_max = matrix_params['y_bounds']
-    z_min, z_max = matrix_params['z_bounds']
-    length_norm = matrix_params['length_norm']
-    width_norm = matrix_params['width_norm']
+    if rng is None:
+        rng = np.random.default_rng(current_config.random_seed)
 
     # Generate more sand particles for better visibility - scale with volume
     total_porosity = np.sum(intr)
@@ -74,73 +79,16 @@ def create_combined_pores_matrix_visualization(
         particle_counts['hybrid_main'] * dimension_scales['volume_scale'])
     sand_particle_count = int(base_particles * (1 + total_porosity / 10))
 
-    # Use bounds from matrix configuration
-    x_sand = np.random.uniform(x_min, x_max, sand_particle_count)
-    y_sand = np.random.uniform(y_min, y_max, sand_particle_count)
-    z_sand = np.random.uniform(z_min, z_max, sand_particle_count)
-
-    # Create particle characteristics based on intrusion data (like sand_dust_viz.py)
-    norm_intrusion = intr / np.max(intr)
-
-    # Generate sand particle properties
-    sand_sizes = []
-    sand_colors = []
-
-    colormap = plt.get_cmap(sample_color)
-
-    for j in range(sand_particle_count):
-        # Map particle position to intrusion characteristics
-        dist_x_norm = abs(x_sand[j]) / length_norm
-        dist_y_norm = abs(y_sand[j]) / width_norm
-        dist_from_center = np.sqrt((dist_x_norm**2 + dist_y_norm**2) / 2)
-
-        # Map to intrusion data
-        data_idx = min(int(dist_from_center * len(intr)), len(intr)-1)
-
-        # Particle size based on pore characteristics (using matrix parameters)
-        base_size = matrix_params['base_particle_size'] + \
-            matrix_params['particle_size_variation'] * norm_intrusion[data_idx]
-        size_variation = np.random.uniform(0.7, 1.3)
-        final_size = base_size * size_variation
-        sand_sizes.append(final_size)
-
-        # Color intensity (using matrix parameters)
-        color_intensity = matrix_params['color_intensity_base'] + \
-            matrix_params['color_intensity_variation'] * \
-            norm_intrusion[data_idx]
-        sand_colors.append(colormap(color_intensity))
-
-    # Sort sand particles by depth for proper rendering
-    sand_distances = np.sqrt(x_sand**2 + y_sand**2 + z_sand**2)
-    sand_sort_indices = np.argsort(-sand_distances)
-
-    # Apply sorting
-    x_sand_sorted = x_sand[sand_sort_indices]
-    y_sand_sorted = y_sand[sand_sort_indices]
-    z_sand_sorted = z_sand[sand_sort_indices]
-    sizes_sand_sorted = np.array(sand_sizes)[sand_sort_indices]
-    colors_sand_sorted = np.array(sand_colors)[sand_sort_indices]
-
     # Render sand particles with enhanced visibility (using matrix parameters)
-    batch_size = matrix_params['batch_size']
-    for batch_start in range(0, len(x_sand_sorted), batch_size):
-        batch_end = min(batch_start + batch_size, len(x_sand_sorted))
-
-        ax.scatter(x_sand_sorted[batch_start:batch_end],
-                   y_sand_sorted[batch_start:batch_end],
-                   z_sand_sorted[batch_start:batch_end],
-                   s=sizes_sand_sorted[batch_start:batch_end],
-                   c=colors_sand_sorted[batch_start:batch_end],
-                   alpha=matrix_params['particle_alpha'],
-                   edgecolors='none',
-                   linewidth=0)  # Force no lines
+    render_particle_fill(ax, intr, sand_particle_count,
+                         plt.get_cmap(sample_color), rng)
 
     # 2. Then, add realistic pores on top
-    print(f"Adding realistic pores for {sample_name}...")
+    logger.info(f"Adding realistic pores for {sample_name}...")
 
     # Generate realistic pores (fewer than individual viz to avoid overcrowding)
     pore_positions, scaled_radii, selected_diameters = generate_realistic_pores(
-        diam, intr, sample_name, n_pores=400)
+        diam, intr, sample_name, n_pores=400, selected_diameters=pore_diameters, rng=rng)
 
     # Set up camera position for depth sorting
     camera_pos = np.array([3.0, 1.0, 1.0])
@@ -150,8 +98,8 @@ def create_combined_pores_matrix_visualization(
                             vmax=np.max(scaled_radii))
 
     # Sort pores by distance from camera for proper rendering
-    distances = np.linalg.norm(
-        pore_positions - camera_pos.reshape(1, 3), axis=1)
+    camera_offsets = pore_positions - camera_pos
+    distances = np.sqrt(np.einsum('ij,ij->i', camera_offsets, camera_offsets))
     z_bonus = pore_positions[:, 2] / 0.4 * 0.2 * np.max(distances)
     adjusted_distances = distances - z_bonus
 
@@ -170,8 +118,8 @@ def create_combined_pores_matrix_visualization(
         micropore_color = sample_color
         mesopore_color = sample_color
         macropore_color = sample_color
-        print(
-            f"[DEBUG] Using sample-specific color for {sample_name}: {sample_color}")
+        logger.debug(
+            f"Using sample-specific color for {sample_name}: {sample_color}")
     else:
         # Use default size-based colors
         micropore_color = pore_colors["micropore_color"]
@@ -187,9 +135,13 @@ def create_combined_pores_matrix_visualization(
     micropore_max = min_radius + radius_range * 0.33
     mesopore_max = min_radius + radius_range * 0.66
 
+    # Shared unit sphere mesh for every pore
+    unit_x, unit_y, unit_z = get_unit_sphere_mesh(12, 8)
+
     # Render pores as spheres (with higher alpha to stand out from sand)
-    print(f"Rendering {len(pore_positions)} pores for {sample_name}...")
-    for i in tqdm(range(len(pore_positions)), desc="Rendering pores"):
+    logger.info(f"Rendering {len(pore_positions)} pores for {sample_name}...")
+    for i in tqdm(range(len(pore_positions)), desc="Rendering pores",
+                  **PROGRESS_OPTIONS):
         radius = scaled_radii[i]
 
         # Assign color based on pore size
@@ -201,16 +153,13 @@ def create_combined_pores_matrix_visualization(
             color = macropore_color
 
         # Create a sphere for each pore
-        u = np.linspace(0, 2 * np.pi, 12)
-        v = np.linspace(0, np.pi, 8)
-        x = pore_positions[i, 0] + radius * np.outer(np.cos(u), np.sin(v))
-        y = pore_positions[i, 1] + radius * np.outer(np.sin(u), np.sin(v))
-        z = pore_positions[i, 2] + radius * \
-            np.outer(np.ones(np.size(u)), np.cos(v))
+        x = pore_positions[i, 0] + radius * unit_x
+        y = pore_positions[i, 1] + radius * unit_y
+        z = pore_positions[i, 2] + radius * unit_z
 
         # Plot with maximum opacity but NO edge lines
         ax.plot_surface(x, y, z, color=color, shade=True, alpha=1.0,
-                        rstride=1, cstride=1, linewidth=0)
+                        rstride=1, cstride=1, linewidth=0, rasterized=True)
 
     # Add sample information
     ax.text2D(0.05, 0.95, sample_name, transform=ax.transAxes, fontsize=12,
@@ -263,13 +212,18 @@ def create_combined_pores_matrix_visualization(
     # If using sample-specific colors, don't show legend
 
     plt.tight_layout()
-    plt.savefig(output_file, dpi=current_config.dpi, bbox_inches='tight')
-    print(f"Combined pores + sand visualization saved to {output_file}")
+    plt.savefig(output_file, **current_config.get_savefig_options())
+    logger.info(f"Combined pores + sand visualization saved to {output_file}")
     plt.close()
 
 
-def create_combined_three_samples_pores_matrix_visualization(diam1, intr1, diam2, intr2, diam3, intr3, output_file):
+def create_combined_three_samples_pores_matrix_visualization(diam1, intr1, diam2, intr2, diam3, intr3, output_file,
+                                                             pore_diameters=(None, None, None),
+                                                             rng=None):
     """Create combined visualization with all three samples showing pores + sand"""
+    if rng is None:
+        rng = np.random.default_rng(config.get_config().random_seed)
+
     fig = plt.figure(figsize=(18, 7))
 
     # Create subplots for each sample
@@ -291,10 +245,10 @@ def create_combined_three_samples_pores_matrix_visualization(diam1, intr1, diam2
     ]
 
     # Process each sample
-    for i, (ax, name, diameters, intrusion, cmap_name) in enumerate(zip(
-            axes, sample_names, diameters_list, intrusion_list, cmaps)):
+    for i, (ax, name, diameters, intrusion, cmap_name, pool) in enumerate(zip(
+            axes, sample_names, diameters_list, intrusion_list, cmaps, pore_diameters)):
 
-        print(f"\nCreating combined pores + sand for {name}...")
+        logger.info(f"\nCreating combined pores + sand for {name}...")
 
         # Setup clean axes
         setup_clean_axes(ax)
@@ -302,120 +256,60 @@ def create_combined_three_samples_pores_matrix_visualization(diam1, intr1, diam2
         # Draw orange prism frame
         plot_orange_prism_frame(ax)
 
-        # Get matrix parameters from configuration (same approach as other functions)
+        # Get particle parameters from configuration
         current_config = config.get_config()
-        matrix_params = current_config.get_matrix_parameters()
         dimension_scales = current_config.get_dimension_scale_factors()
         particle_counts = current_config.get_particle_counts()
         size_params = current_config.get_particle_size_parameters()
 
-        # Use matrix parameters from configuration
-        x_min, x_max = matrix_params['x_bounds']
-        y_min, y_max = matrix_params['y_bounds']
-        z_min, z_max = matrix_params['z_bounds']
-        length_norm = matrix_params['length_norm']
-        width_norm = matrix_params['width_norm']
-
         total_porosity = np.sum(intrusion)
         base_particles = int(
             particle_counts['hybrid_combined'] * dimension_scales['volume_scale'])
         sand_particle_count = int(base_particles * (1 + total_porosity / 15))
 
-        x_sand = np.random.uniform(x_min, x_max, sand_particle_count)
-        y_sand = np.random.uniform(y_min, y_max, sand_particle_count)
-        z_sand = np.random.uniform(z_min, z_max, sand_particle_count)
-
-        # Create particle characteristics like sand_dust_viz.py
-        norm_intrusion = intrusion / np.max(intrusion)
-
-        sand_sizes = []
-        sand_colors = []
+        # Slightly smaller particles with higher color intensity for visibility
         colormap = plt.get_cmap(cmap_name)
-
-        for j in range(sand_particle_count):
-            # Map particle position to intrusion characteristics
-            dist_x_norm = abs(x_sand[j]) / length_norm
-            dist_y_norm = abs(y_sand[j]) / width_norm
-            dist_from_center = np.sqrt((dist_x_norm**2 + dist_y_norm**2) / 2)
-
-            # Map to intrusion data
-            data_idx = min(
-                int(dist_from_center * len(intrusion)), len(intrusion)-1)
-
-            # Particle size and color (same approach as sand_dust_viz.py)
-            # Slightly smaller for combined view
-            base_size = 0.6 + 1.0 * norm_intrusion[data_idx]
-            size_variation = np.random.uniform(0.7, 1.3)
-            final_size = base_size * size_variation
-            sand_sizes.append(final_size)
-
-            # Higher color intensity for visibility
-            color_intensity = size_params['color_intensity_base'] + \
-                size_params['color_intensity_variation'] * \
-                norm_intrusion[data_idx]
-            sand_colors.append(colormap(color_intensity))
-
-        # Sort and render with high visibility
-        sand_distances = np.sqrt(x_sand**2 + y_sand**2 + z_sand**2)
-        sand_sort_indices = np.argsort(-sand_distances)
-
-        x_sand_sorted = x_sand[sand_sort_indices]
-        y_sand_sorted = y_sand[sand_sort_indices]
-        z_sand_sorted = z_sand[sand_sort_indices]
-        sizes_sand_sorted = np.array(sand_sizes)[sand_sort_indices]
-        colors_sand_sorted = np.array(sand_colors)[sand_sort_indices]
-
-        # Render with matrix parameters
-        ax.scatter(x_sand_sorted, y_sand_sorted, z_sand_sorted,
-                   s=sizes_sand_sorted, c=colors_sand_sorted,
-                   alpha=matrix_params['particle_alpha'], edgecolors='none')
+        render_particle_fill(ax, intrusion, sand_particle_count, colormap, rng,
+                             size_base=0.6, size_variation=1.0,
+                             intensity_base=size_params['color_intensity_base'],
+                             intensity_variation=size_params['color_intensity_variation'])
 
         # Add realistic pores
         pore_positions, scaled_radii, _ = generate_realistic_pores(
-            diameters, intrusion, name, n_pores=300)  # Fewer pores for combined view
+            diameters, intrusion, name, n_pores=300,  # Fewer pores for combined view
+            selected_diameters=pool, rng=rng)
 
         # Sort and render pores
         camera_pos = np.array([3.0, 1.0, 1.0])
-        distances = np.linalg.norm(
-            pore_positions - camera_pos.reshape(1, 3), axis=1)
-        sort_indices = np.argsort(-distances)
+        camera_offsets = pore_positions - camera_pos
+        # Squared distance gives the same back-to-front order
+        distances_sq = np.einsum('ij,ij->i', camera_offsets, camera_offsets)
+        sort_indices = np.argsort(-distances_sq)
         pore_positions = pore_positions[sort_indices]
         scaled_radii = scaled_radii[sort_indices]
 
         # Render pores with higher visibility
         norm = colors.Normalize(vmin=np.min(
             scaled_radii), vmax=np.max(scaled_radii))
-        for j in tqdm(range(len(pore_positions)), desc=f"Rendering {name} pores"):
+        unit_x, unit_y, unit_z = get_unit_sphere_mesh(8, 5)
+        for j in tqdm(range(len(pore_positions)), desc=f"Rendering {name} pores",
+                      **PROGRESS_OPTIONS):
             radius = scaled_radii[j]
             color = colormap(0.7 + 0.3 * norm(radius))
 
-            u = np.linspace(0, 2 * np.pi, 8)
-            v = np.linspace(0, np.pi, 5)
-            x = pore_positions[j, 0] + radius * np.outer(np.cos(u), np.sin(v))
-            y = pore_positions[j, 1] + radius * np.outer(np.sin(u), np.sin(v))
-            z = pore_positions[j, 2] + radius * \
-                np.outer(np.ones(np.size(u)), np.cos(v))
+            x = pore_positions[j, 0] + radius * unit_x
+            y = pore_positions[j, 1] + radius * unit_y
+            z = pore_positions[j, 2] + radius * unit_z
 
             ax.plot_surface(x, y, z, color=color, shade=True, alpha=0.9,
-                            rstride=1, cstride=1, linewidth=0)
+                            rstride=1, cstride=1, linewidth=0, rasterized=True)
 
         # Add sample label
         ax.text2D(0.05, 0.95, name, transform=ax.transAxes, fontsize=12,
                   fontweight='bold', bbox=dict(facecolor='white', alpha=0.7, boxstyle='round,pad=0.3'))
 
     plt.tight_layout()
-    plt.savefig(output_file, dpi=current_config.dpi, bbox_inches='tight')
-    print(
+    plt.savefig(output_file, **current_config.get_savefig_options())
+    logger.info(
         f"Combined three-sample pores + sand visualization saved to {output_file}")
     plt.close()
-    print(
-        f"Combined three-sample pores + sand visualization saved to {output_file}")
-    plt.close()
-    print(
-        f"Combined three-sample pores + sand visualization saved to {output_file}")
-    plt.close()
-    print(
-        f"Combined three-sample pores + sand visualization saved to {output_file}")
-    plt.close()
-    plt.close()
-    plt.close()
@@ -7,16 +7,64 @@ CSA cement-based board compositions, based on experimental mercury intrusion
 porosimetry characterization data.
 """
 
+import logging
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
-from tqdm import tqdm
-from .utils import plot_orange_prism_frame, setup_clean_axes, generate_realistic_pores
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from .utils import (plot_orange_prism_frame, setup_clean_axes, generate_realistic_pores,
+                    get_unit_sphere_faces, run_parallel_jobs)
 from .config import get_config
 
+logger = logging.getLogger(__name__)
+
+
+def _shaded_sphere_faces(pore_positions, radii, pore_colors, resolution):
+    """
+    Build the shaded polygon faces of a group of spherical pores.
+
+    Parameters:
+    -----------
+    pore_positions : numpy.ndarray
+        Array of shape (N, 3) with pore center coordinates
+    radii : numpy.ndarray
+        Visualization radius of each pore
+    pore_colors : numpy.ndarray
+        RGBA color of each pore, shape (N, 4)
+    resolution : tuple
+        (u_resolution, v_resolution) of the sphere mesh
+
+    Returns:
+    --------
+    tuple
+        (faces, face_colors) with shapes (N * n_faces, 4, 3) and (N * n_faces, 4)
+    """
+    unit_faces, face_shading = get_unit_sphere_faces(*resolution)
+    n_faces = len(unit_faces)
+
+    # Place every sphere face at once as (n_pores * n_faces, 4, 3) polygons
+    faces = (unit_faces * radii[:, np.newaxis, np.newaxis, np.newaxis]
+             + pore_positions[:, np.newaxis, np.newaxis, :]).reshape(-1, 4, 3)
+
+    # Shade each pore's color per face
+    face_colors = np.repeat(pore_colors, n_faces, axis=0)
+    face_colors[:, :3] *= np.tile(face_shading, len(pore_positions))[:, np.newaxis]
+
+    return faces, face_colors
+
+
+def _sphere_resolutions(config):
+    """
+    Return the (coarse, full) sphere mesh resolutions used for pore rendering.
+    """
+    coarse_resolution = (min(8, config.sphere_u_resolution),
+                         min(6, config.sphere_v_resolution))
+    full_resolution = (config.sphere_u_resolution, config.sphere_v_resolution)
+    return coarse_resolution, full_resolution
+
 
 def create_clean_pore_visualization(ax, diameters, intrusion_values, sample_name,
-                                    sample_color='jet'):
+                                    sample_color='jet', pore_diameters=None, rng=None):
     """
     Create a detailed 3D pore structure model for individual board composition.
 
@@ -36,6 +84,11 @@ def create_clean_pore_visualization(ax, diameters, intrusion_values, sample_name
         Board composition identifier (T1, T2, or T3)
     sample_color : str, default='jet'
         Colormap for pore size visualization
+    pore_diameters : array_like, optional
+        Pre-sampled pore diameters to use instead of drawing new ones
+    rng : numpy.random.Generator, optional
+        Random generator for pore and particle sampling (defaults to one
+        seeded from the configured random seed)
     """
     config = get_config()
 
@@ -47,7 +100,8 @@ def create_clean_pore_visualization(ax, diameters, intrusion_values, sample_name
 
     # Generate realistic pores using config parameters
     pore_positions, scaled_radii, selected_diameters = generate_realistic_pores(
-        diameters, intrusion_values, sample_name, n_pores=config.n_pores_individual)
+        diameters, intrusion_values, sample_name, n_pores=config.n_pores_individual,
+        selected_diameters=pore_diameters, rng=rng)
 
     # Set up camera position for depth sorting from config
     camera_pos = config.camera_position
@@ -58,8 +112,8 @@ def create_clean_pore_visualization(ax, diameters, intrusion_values, sample_name
                             vmax=np.max(scaled_radii))
 
     # Sort pores by distance from camera for proper rendering
-    distances = np.linalg.norm(
-        pore_positions - camera_pos.reshape(1, 3), axis=1)
+    camera_offsets = pore_positions - camera_pos
+    distances = np.sqrt(np.einsum('ij,ij->i', camera_offsets, camera_offsets))
     # Add z-height bonus to keep high pores visible using config parameter
     z_bonus = pore_positions[:, 2] / config.thickness_scale * \
         config.z_depth_bonus * np.max(distances)
@@ -70,23 +124,43 @@ def create_clean_pore_visualization(ax, diameters, intrusion_values, sample_name
     pore_positions = pore_positions[sort_indices]
     scaled_radii = scaled_radii[sort_indices]
 
-    # Render pores as spheres using config parameters
-    print(f"Rendering {len(pore_positions)} pores for {sample_name}...")
-    for i in tqdm(range(len(pore_positions)), desc="Rendering pores"):
-        radius = scaled_radii[i]
-        color = colormap(norm(radius))
-
-        # Create a sphere for each pore using config resolution settings
-        u = np.linspace(0, 2 * np.pi, config.sphere_u_resolution)
-        v = np.linspace(0, np.pi, config.sphere_v_resolution)
-        x = pore_positions[i, 0] + radius * np.outer(np.cos(u), np.sin(v))
-        y = pore_positions[i, 1] + radius * np.outer(np.sin(u), np.sin(v))
-        z = pore_positions[i, 2] + radius * \
-            np.outer(np.ones(np.size(u)), np.cos(v))
-
-        # Render the sphere with config transparency
-        ax.plot_surface(x, y, z, color=color, alpha=config.alpha_transparency,
-                        edgecolor='none', shade=True)
+    # Approximate on-screen pore radius in pixels at the output resolution
+    axes_width_px = ax.get_position().width * ax.figure.get_figwidth() * config.dpi
+    pixel_radii = scaled_radii * axes_width_px / np.ptp(config.x_limits)
+
+    # Level of detail: subpixel pores become points, pores only a couple of
+    # pixels wide get a coarse sphere, the rest use the configured resolution
+    pore_colors = colormap(norm(scaled_radii))
+    is_point = pixel_radii < 0.5
+    is_coarse = ~is_point & (pixel_radii < 2.0)
+    is_full = pixel_radii >= 2.0
+
+    logger.info(f"Rendering {len(pore_positions)} pores for {sample_name}...")
+    if np.any(is_point):
+        ax.scatter(*pore_positions[is_point].T, s=1, c=pore_colors[is_point],
+                   alpha=config.alpha_transparency, edgecolors='none',
+                   rasterized=True)
+
+    coarse_resolution, full_resolution = _sphere_resolutions(config)
+    sphere_faces = []
+    face_colors = []
+    for mask, resolution in ((is_coarse, coarse_resolution),
+                             (is_full, full_resolution)):
+        if not np.any(mask):
+            continue
+        faces, colors_per_face = _shaded_sphere_faces(
+            pore_positions[mask], scaled_radii[mask], pore_colors[mask], resolution)
+        sphere_faces.append(faces)
+        face_colors.append(colors_per_face)
+
+    # Render all sphere pores as a single collection
+    if sphere_faces:
+        face_colors = np.concatenate(face_colors)
+        face_colors[:, 3] = config.alpha_transparency
+        pore_collection = Poly3DCollection(np.concatenate(sphere_faces),
+                                           facecolors=face_colors,
+                                           edgecolors='none', rasterized=True)
+        ax.add_collection3d(pore_collection)
 
     # Add sample information in clean format
     ax.text2D(0.05, 0.95, sample_name, transform=ax.transAxes, fontsize=12,
@@ -94,7 +168,8 @@ def create_clean_pore_visualization(ax, diameters, intrusion_values, sample_name
 
 
 def create_individual_sample_visualization(diam, intr, sample_name, output_file,
-                                           sample_color='jet'):
+                                           sample_color='jet', pore_diameters=None,
+                                           rng=None):
     """
     Create computational model for individual insulating board composition.
 
@@ -113,6 +188,11 @@ def create_individual_sample_visualization(diam, intr, sample_name, output_file,
         Path for saving the generated model
     sample_color : str, default='jet'
         Colormap for visualization
+    pore_diameters : array_like, optional
+        Pre-sampled pore diameters to use instead of drawing new ones
+    rng : numpy.random.Generator, optional
+        Random generator for pore and particle sampling (defaults to one
+        seeded from the configured random seed)
     """
     config = get_config()
 
@@ -121,10 +201,32 @@ def create_individual_sample_visualization(diam, intr, sample_name, output_file,
     ax = fig.add_subplot(111, projection='3d')
 
     # Create the clean visualization
-    create_clean_pore_visualization(ax, diam, intr, sample_name, sample_color)
+    create_clean_pore_visualization(ax, diam, intr, sample_name, sample_color,
+                                    pore_diameters, rng)
 
     # Save with config parameters
-    plt.savefig(output_file, dpi=config.dpi, bbox_inches='tight',
-                format=config.output_format)
-    print(f"Individual board model saved to {output_file}")
+    plt.savefig(output_file, format=config.output_format,
+                **config.get_savefig_options())
+    logger.info(f"Individual board model saved to {output_file}")
     plt.close(fig)
+
+
+def create_individual_sample_visualizations(jobs):
+    """
+    Create the individual board models for several compositions.
+
+    Each board model is independent, so when parallel rendering is enabled
+    in the configuration every board is rendered in its own worker process.
+    The unit sphere meshes are built once up front so the forked workers
+    share them instead of each rebuilding the same sin/cos tables.
+
+    Parameters:
+    -----------
+    jobs : list of tuple
+        (diam, intr, sample_name, output_file, sample_color[, pore_diameters,
+        rng]) for each board
+    """
+    for resolution in _sphere_resolutions(get_config()):
+        get_unit_sphere_faces(*resolution)
+
+    run_parallel_jobs(create_individual_sample_visualization, jobs)
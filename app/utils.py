@@ -7,10 +7,31 @@ This module provides geometric framework and pore generation algorithms
 for computational modeling of experimental mercury intrusion porosimetry data.
 """
 
+import logging
+import signal
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing import get_all_start_methods, get_context
+
 import numpy as np
 import matplotlib.pyplot as plt
-from tqdm import tqdm
-from .config import get_config
+from matplotlib.colors import LightSource
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from .config import get_config, BOARD_EDGES
+
+logger = logging.getLogger(__name__)
+
+# Progress bar settings for per-item loops: throttle redraws and stay quiet
+# when output is not an interactive terminal
+PROGRESS_OPTIONS = dict(mininterval=1.0, miniters=100,
+                        disable=not sys.stderr.isatty())
+
+# Fully transparent RGBA color for the 3D axis panes
+_PANE_TRANSPARENT = (1.0, 1.0, 1.0, 0.0)
+
+# Function and argument list shared with forked run_parallel_jobs workers
+_parallel_jobs = None
 
 
 def plot_orange_prism_frame(ax, color=None, linewidth=None, alpha=None):
@@ -43,14 +64,11 @@ def plot_orange_prism_frame(ax, color=None, linewidth=None, alpha=None):
 
     # Get board corner coordinates from config
     corners = config.get_board_corners()
-    edges = config.get_board_edges()
 
-    # Plot the edges with configured styling
-    for edge in edges:
-        ax.plot([corners[edge[0], 0], corners[edge[1], 0]],
-                [corners[edge[0], 1], corners[edge[1], 1]],
-                [corners[edge[0], 2], corners[edge[1], 2]],
-                color=color, linewidth=linewidth, alpha=alpha)
+    # Draw all edges as a single collection with configured styling
+    segments = corners[BOARD_EDGES]
+    ax.add_collection3d(Line3DCollection(segments, colors=color,
+                                         linewidths=linewidth, alpha=alpha))
 
     # Set visualization boundaries from config
     x_limits, y_limits, z_limits = config.x_limits, config.y_limits, config.z_limits
@@ -77,9 +95,9 @@ def setup_clean_axes(ax):
     ax.set_axis_off()
 
     # Create transparent background for professional appearance
-    ax.xaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))
-    ax.yaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))
-    ax.zaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))
+    ax.xaxis.set_pane_color(_PANE_TRANSPARENT)
+    ax.yaxis.set_pane_color(_PANE_TRANSPARENT)
+    ax.zaxis.set_pane_color(_PANE_TRANSPARENT)
 
     # Disable grid lines for cleaner visualization
     ax.grid(False)
@@ -96,7 +114,405 @@ def setup_clean_axes(ax):
     ax.view_init(elev=config.view_elevation, azim=config.view_azimuth)
 
 
-def generate_realistic_pores(diameters, intrusion_values, sample_name, n_pores=None):
+def _trig_table(stop, n_points):
+    """
+    Tabulate cos and sin over evenly spaced angles from 0 to stop.
+
+    Uses the angle-sum recurrence so only one cos/sin evaluation is needed
+    per table, matching ``np.linspace(0, stop, n_points)`` sample points.
+
+    Parameters:
+    -----------
+    stop : float
+        Final angle in radians (included)
+    n_points : int
+        Number of sample angles
+
+    Returns:
+    --------
+    tuple
+        (cos, sin) arrays of length n_points
+    """
+    cos_table = np.empty(n_points)
+    sin_table = np.empty(n_points)
+    cos_table[0], sin_table[0] = 1.0, 0.0
+    if n_points < 2:
+        return cos_table, sin_table
+
+    step = stop / (n_points - 1)
+    cos_step, sin_step = np.cos(step), np.sin(step)
+    for k in range(1, n_points):
+        cos_table[k] = cos_table[k - 1] * cos_step - sin_table[k - 1] * sin_step
+        sin_table[k] = sin_table[k - 1] * cos_step + cos_table[k - 1] * sin_step
+
+    return cos_table, sin_table
+
+
+@lru_cache(maxsize=4)
+def get_unit_sphere_mesh(u_resolution, v_resolution):
+    """
+    Build the unit sphere surface mesh used to render every pore.
+
+    The mesh depends only on the sphere resolution, so it is computed once
+    and shared across all pores and figures. The returned arrays are
+    read-only; translate and scale them to place a pore.
+
+    Parameters:
+    -----------
+    u_resolution : int
+        Azimuthal sphere resolution
+    v_resolution : int
+        Polar sphere resolution
+
+    Returns:
+    --------
+    tuple
+        (x, y, z) arrays of shape (u_resolution, v_resolution)
+    """
+    cos_u, sin_u = _trig_table(2 * np.pi, u_resolution)
+    cos_v, sin_v = _trig_table(np.pi, v_resolution)
+    x = np.outer(cos_u, sin_v)
+    y = np.outer(sin_u, sin_v)
+    z = np.outer(np.ones(u_resolution), cos_v)
+
+    for mesh in (x, y, z):
+        mesh.setflags(write=False)
+
+    return x, y, z
+
+
+@lru_cache(maxsize=4)
+def get_unit_sphere_faces(u_resolution, v_resolution):
+    """
+    Build the quad faces of the unit sphere mesh with their light shading.
+
+    Faces follow the same vertex order as ``plot_surface`` and the shading
+    reproduces its default light source, so pores drawn from these faces
+    look identical to per-pore surfaces. Shading only depends on face
+    orientation, which scaling and translation preserve, so it is computed
+    once per resolution. The returned arrays are read-only.
+
+    Parameters:
+    -----------
+    u_resolution : int
+        Azimuthal sphere resolution
+    v_resolution : int
+        Polar sphere resolution
+
+    Returns:
+    --------
+    tuple
+        (faces, shading) where faces has shape (n_faces, 4, 3) and shading
+        holds the brightness factor of each face
+    """
+    mesh = np.stack(get_unit_sphere_mesh(u_resolution, v_resolution), axis=-1)
+
+    # Quad corners in plot_surface perimeter order
+    faces = np.stack([mesh[:-1, :-1], mesh[:-1, 1:],
+                      mesh[1:, 1:], mesh[1:, :-1]], axis=2).reshape(-1, 4, 3)
+
+    # Face normals and shading from matplotlib's default 3D light source
+    normals = np.cross(faces[:, 0] - faces[:, 1], faces[:, 1] - faces[:, 2])
+    light = LightSource(azdeg=225, altdeg=19.4712).direction
+    with np.errstate(invalid='ignore'):
+        shade = (normals / np.linalg.norm(normals, axis=1, keepdims=True)) @ light
+    shade[np.isnan(shade)] = 0
+    shading = 0.3 + 0.7 * (shade + 1) / 2
+
+    faces.setflags(write=False)
+    shading.setflags(write=False)
+
+    return faces, shading
+
+
+def render_particle_fill(ax, intrusion_values, particle_count, colormap, rng,
+                         size_base=None, size_variation=None,
+                         intensity_base=None, intensity_variation=None):
+    """
+    Fill the board volume with sand/dust matrix particles.
+
+    Particles are placed uniformly within the matrix bounds, and their size
+    and color follow the normalized intrusion data sampled at each particle's
+    distance from the board center. Sizing and color parameters default to
+    the configured matrix parameters.
+
+    Parameters:
+    -----------
+    ax : matplotlib 3D axis
+        The 3D plotting axis for rendering the particles
+    intrusion_values : array_like
+        Mercury intrusion volume data for the board
+    particle_count : int
+        Number of particles to generate
+    colormap : matplotlib colormap
+        Colormap for particle coloring
+    rng : numpy.random.Generator
+        Random generator used for particle placement and size variation
+    size_base, size_variation : float, optional
+        Particle size as size_base + size_variation * local intrusion
+    intensity_base, intensity_variation : float, optional
+        Color intensity as intensity_base + intensity_variation * local intrusion
+    """
+    config = get_config()
+    matrix_params = config.get_matrix_parameters()
+
+    if size_base is None:
+        size_base = matrix_params['base_particle_size']
+    if size_variation is None:
+        size_variation = matrix_params['particle_size_variation']
+    if intensity_base is None:
+        intensity_base = matrix_params['color_intensity_base']
+    if intensity_variation is None:
+        intensity_variation = matrix_params['color_intensity_variation']
+
+    # Positions are kept in float32, the precision matplotlib renders with
+    x_min, x_max = matrix_params['x_bounds']
+    y_min, y_max = matrix_params['y_bounds']
+    z_min, z_max = matrix_params['z_bounds']
+    positions = rng.uniform((x_min, y_min, z_min), (x_max, y_max, z_max),
+                            size=(particle_count, 3)).astype(np.float32)
+    x_positions, y_positions, z_positions = positions.T
+
+    # Map particle positions to intrusion characteristics
+    intrusion_values = np.asarray(intrusion_values)
+    norm_intrusion = intrusion_values / np.max(intrusion_values)
+    dist_x_norm = x_positions / matrix_params['length_norm']
+    dist_y_norm = y_positions / matrix_params['width_norm']
+    dist_from_center = np.sqrt((dist_x_norm**2 + dist_y_norm**2) * 0.5)
+
+    data_idx = np.minimum((dist_from_center * len(intrusion_values)).astype(np.intp),
+                          len(intrusion_values) - 1)
+    local_intrusion = norm_intrusion[data_idx]
+
+    # Particle size and color based on local pore characteristics
+    size_jitter = rng.uniform(0.7, 1.3, particle_count)
+    particle_sizes = ((size_base + size_variation * local_intrusion) *
+                      size_jitter).astype(np.float32)
+    particle_colors = colormap(
+        intensity_base + intensity_variation * local_intrusion).astype(np.float32)
+
+    # Render all particles as a single scatter collection
+    ax.scatter(x_positions, y_positions, z_positions,
+               s=particle_sizes, c=particle_colors,
+               alpha=matrix_params['particle_alpha'],
+               edgecolors='none', linewidth=0,
+               rasterized=True)
+
+
+@lru_cache(maxsize=8)
+def _build_alias_table(probabilities):
+    """
+    Build a Vose alias table for sampling a discrete distribution.
+
+    Parameters:
+    -----------
+    probabilities : tuple of float
+        Probability of each outcome (must sum to one)
+
+    Returns:
+    --------
+    tuple
+        (alias, accept) arrays of length len(probabilities)
+    """
+    n_outcomes = len(probabilities)
+    scaled = np.asarray(probabilities, dtype=np.float64) * n_outcomes
+    alias = np.arange(n_outcomes)
+    accept = np.ones(n_outcomes)
+
+    small = [i for i in range(n_outcomes) if scaled[i] < 1.0]
+    large = [i for i in range(n_outcomes) if scaled[i] >= 1.0]
+    while small and large:
+        lesser, greater = small.pop(), large.pop()
+        accept[lesser] = scaled[lesser]
+        alias[lesser] = greater
+        scaled[greater] -= 1.0 - scaled[lesser]
+        if scaled[greater] < 1.0:
+            small.append(greater)
+        else:
+            large.append(greater)
+
+    alias.setflags(write=False)
+    accept.setflags(write=False)
+
+    return alias, accept
+
+
+def _sample_alias(probabilities, size, rng):
+    """
+    Draw outcome indices from a discrete distribution using an alias table.
+
+    Parameters:
+    -----------
+    probabilities : numpy.ndarray
+        Probability of each outcome (must sum to one)
+    size : int
+        Number of indices to draw
+    rng : numpy.random.Generator
+        Random generator used for the draws
+
+    Returns:
+    --------
+    numpy.ndarray
+        Sampled outcome indices
+    """
+    alias, accept = _build_alias_table(tuple(probabilities.tolist()))
+    columns = rng.integers(0, len(alias), size=size)
+    return np.where(rng.random(size) < accept[columns], columns, alias[columns])
+
+
+def sample_pore_diameters(diameters, intrusion_values, n_pores, rng=None):
+    """
+    Draw pore diameters with frequencies following the MIP intrusion data.
+
+    Parameters:
+    -----------
+    diameters : array_like
+        Experimental pore diameter data from MIP testing
+    intrusion_values : array_like
+        Mercury intrusion volume data corresponding to each diameter
+    n_pores : int
+        Number of pore diameters to draw
+    rng : numpy.random.Generator, optional
+        Random generator for the draws (defaults to one seeded from the
+        configured random seed)
+
+    Returns:
+    --------
+    numpy.ndarray
+        Sampled pore diameters
+    """
+    if rng is None:
+        rng = np.random.default_rng(get_config().random_seed)
+
+    # Normalize intrusion data to create probability distribution
+    norm_intrusion = intrusion_values / np.sum(intrusion_values)
+
+    # Sample pore diameters based on experimental frequency distribution
+    indices = _sample_alias(norm_intrusion, n_pores, rng)
+    return diameters[indices]
+
+
+def _sample_pore_positions(n_pores, x_bound, y_bound, z_bound, positioning_params, rng,
+                           dtype=np.float32):
+    """
+    Sample pore center positions across the board placement regions.
+
+    Pores are split between the upper region, a diagonal pattern, the top
+    edges and corners, and the remaining volume. Each region is drawn as one
+    batch into a preallocated array.
+
+    Parameters:
+    -----------
+    n_pores : int
+        Number of pores to place
+    x_bound, y_bound, z_bound : float
+        Half extents of the placement volume
+    positioning_params : dict
+        Positioning parameters from the configuration
+    rng : numpy.random.Generator
+        Random generator used for all position draws
+    dtype : numpy dtype, default=numpy.float32
+        Floating point type of the returned positions
+
+    Returns:
+    --------
+    numpy.ndarray
+        Column-major array of shape (n_pores, 3) with pore center coordinates
+    """
+    edge_factor = positioning_params['edge_position_factor']
+    corner_factor = positioning_params['corner_position_factor']
+    bounds = np.array([x_bound, y_bound, z_bound])
+
+    # Pores per placement region
+    # Region sizes are capped so the slices always cover exactly n_pores rows,
+    # even if the configured diagonal ratio pushes the total above 100%
+    top_pores = int(n_pores * 0.4)
+    edge_pores = int(n_pores * 0.15)
+    diag_pores = min(int(n_pores * positioning_params['diagonal_pore_ratio']),
+                     n_pores - top_pores - edge_pores)
+    remaining = n_pores - top_pores - diag_pores - edge_pores
+
+    # Each region writes directly into its slice of one preallocated array.
+    # Column-major layout keeps the x, y and z columns contiguous for the
+    # per-axis consumers (scatter, bounds checks)
+    pore_positions = np.empty((n_pores, 3), dtype=dtype, order='F')
+    diag_start = top_pores
+    edge_start = diag_start + diag_pores
+    rest_start = edge_start + edge_pores
+    top = pore_positions[:diag_start]
+    diag = pore_positions[diag_start:edge_start]
+    edge = pore_positions[edge_start:rest_start]
+    rest = pore_positions[rest_start:]
+
+    # Per-axis jitter strength, with less jitter in Z direction
+    jitter = positioning_params['jitter_strength']
+    jitter_scale = np.array(
+        [jitter, jitter, jitter * positioning_params['z_jitter_factor']])
+
+    # Helper function to add small jitter to a batch of pores in place
+    def add_jitter(positions):
+        positions += rng.standard_normal(positions.shape) * jitter_scale
+        # Ensure pores stay within board bounds in a single clip pass
+        np.clip(positions, -bounds, bounds, out=positions)
+
+    # Helper function to draw random -1/+1 signs
+    def random_signs(count):
+        return 2 * rng.integers(0, 2, size=count) - 1
+
+    # 1. Add pores in the upper region (40%)
+    # Use exponential distribution to concentrate toward top
+    z_val = z_bound * (1 - rng.exponential(0.3, size=top_pores))
+    top[:, 2] = np.clip(z_val, 0.0, z_bound)
+    # Distribute across the x-y plane
+    top[:, 0] = rng.uniform(-x_bound, x_bound, size=top_pores)
+    top[:, 1] = rng.uniform(-y_bound, y_bound, size=top_pores)
+
+    # 2. Add pores in a diagonal pattern (configurable percentage)
+    # Parametric position along diagonal (weighted toward top)
+    t = rng.beta(1.5, 1.0, size=diag_pores)
+    diag[:, 0] = x_bound * (1 - t * edge_factor) * random_signs(diag_pores)
+    diag[:, 1] = y_bound * (1 - t * edge_factor) * random_signs(diag_pores)
+    diag[:, 2] = z_bound * (1 - t * 0.5)
+    add_jitter(diag)
+
+    # 3. Add pores along the edges (15%)
+    # Edge kind: 0 = top-x, 1 = top-y, 2 = corner; each branch only draws
+    # the values for the pores that took it
+    edge_kind = rng.integers(0, 3, size=edge_pores)
+    top_x = np.flatnonzero(edge_kind == 0)
+    top_y = np.flatnonzero(edge_kind == 1)
+    corner = np.flatnonzero(edge_kind == 2)
+
+    # Helper function for a signed offset between factor and the bound
+    def signed_offset(bound, factor, count):
+        return bound * (factor + (1 - factor) * rng.random(count)) * random_signs(count)
+
+    # Along the top x edges
+    edge[top_x, 0] = rng.uniform(-x_bound, x_bound, size=len(top_x))
+    edge[top_x, 1] = signed_offset(y_bound, edge_factor, len(top_x))
+    edge[top_x, 2] = z_bound * (0.8 + 0.2 * rng.random(len(top_x)))
+
+    # Along the top y edges
+    edge[top_y, 0] = signed_offset(x_bound, edge_factor, len(top_y))
+    edge[top_y, 1] = rng.uniform(-y_bound, y_bound, size=len(top_y))
+    edge[top_y, 2] = z_bound * (0.8 + 0.2 * rng.random(len(top_y)))
+
+    # Near the corners
+    edge[corner, 0] = signed_offset(x_bound, corner_factor, len(corner))
+    edge[corner, 1] = signed_offset(y_bound, corner_factor, len(corner))
+    edge[corner, 2] = z_bound * (corner_factor + (1 - corner_factor) * rng.random(len(corner)))
+
+    add_jitter(edge)
+
+    # 4. Add remaining pores throughout the volume (20%)
+    rest[:] = rng.uniform(-bounds, bounds, size=(remaining, 3))
+
+    return pore_positions
+
+
+def generate_realistic_pores(diameters, intrusion_values, sample_name, n_pores=None,
+                             rng=None, dtype=np.float32,
+                             selected_diameters=None):
     """
     Generate realistic 3D pore distribution based on experimental MIP data.
 
@@ -116,12 +532,23 @@ def generate_realistic_pores(diameters, intrusion_values, sample_name, n_pores=N
     n_pores : int, optional
         Target number of pores to generate for visualization
         If None, uses config default for individual visualizations
+    rng : numpy.random.Generator, optional
+        Random generator for pore sampling (defaults to one seeded from
+        the configured random seed)
+    dtype : numpy dtype, default=numpy.float32
+        Floating point type of the visualization-only positions and radii;
+        selected diameters keep the precision of the input data
+    selected_diameters : array_like, optional
+        Pre-sampled pore diameters shared between visualizations; the first
+        n_pores are used and only any shortfall is drawn from the MIP data
 
     Returns:
     --------
     tuple
         (pore_positions, scaled_radii, selected_diameters)
-        - pore_positions: 3D coordinates of pore centers
+        - pore_positions: 3D coordinates of pore centers, shape (n_pores, 3);
+          stored column-major so ``x, y, z = pore_positions.T`` are
+          contiguous arrays ready for a single ``ax.scatter`` call
         - scaled_radii: Visualization radii in normalized coordinates  
         - selected_diameters: Actual pore diameters from MIP data
     """
@@ -130,15 +557,22 @@ def generate_realistic_pores(diameters, intrusion_values, sample_name, n_pores=N
     # Use config default if n_pores not specified
     if n_pores is None:
         n_pores = config.n_pores_individual
+    if rng is None:
+        rng = np.random.default_rng(config.random_seed)
 
-    print(f"Generating {n_pores} realistic pores for {sample_name}...")
-
-    # Normalize intrusion data to create probability distribution
-    norm_intrusion = intrusion_values / np.sum(intrusion_values)
+    logger.info(f"Generating {n_pores} realistic pores for {sample_name}...")
 
-    # Sample pore diameters based on experimental frequency distribution
-    indices = np.random.choice(len(diameters), size=n_pores, p=norm_intrusion)
-    selected_diameters = diameters[indices]
+    if selected_diameters is None:
+        selected_diameters = sample_pore_diameters(
+            diameters, intrusion_values, n_pores, rng)
+    else:
+        # Reuse the shared draws, topping up if the pool is too small
+        selected_diameters = np.asarray(selected_diameters)[:n_pores]
+        if len(selected_diameters) < n_pores:
+            selected_diameters = np.concatenate([
+                selected_diameters,
+                sample_pore_diameters(diameters, intrusion_values,
+                                      n_pores - len(selected_diameters), rng)])
 
     # Convert diameters to μm for visualization and scale to fit in board geometry
     selected_diameters_um = selected_diameters / 1000.0  # nm to μm
@@ -146,15 +580,15 @@ def generate_realistic_pores(diameters, intrusion_values, sample_name, n_pores=N
 
     # Scale radii for visualization using config parameters
     min_radius, max_radius = config.min_pore_radius, config.max_pore_radius
-    if np.max(selected_radii) != np.min(selected_radii):
+    radius_lo, radius_hi = selected_radii.min(), selected_radii.max()
+    if radius_hi != radius_lo:
         scaled_radii = min_radius + (max_radius - min_radius) * (
-            selected_radii - np.min(selected_radii)) / (np.max(selected_radii) - np.min(selected_radii))
+            selected_radii - radius_lo) / (radius_hi - radius_lo)
     else:
-        scaled_radii = np.ones_like(
-            selected_radii) * ((min_radius + max_radius) / 2)
+        scaled_radii = np.full_like(selected_radii, (min_radius + max_radius) / 2)
 
     # Apply global pore scaling factor from config
-    scaled_radii *= config.pore_scale_factor
+    scaled_radii = (scaled_radii * config.pore_scale_factor).astype(dtype, copy=False)
 
     # Generate pore positions within the board bounds from config
     positioning_params = config.get_positioning_parameters()
@@ -165,86 +599,107 @@ def generate_realistic_pores(diameters, intrusion_values, sample_name, n_pores=N
     # Configurable margin from top/bottom
     z_bound = config.thickness_scale * positioning_params['z_margin_factor']
 
-    pore_positions = []
-
-    # Helper function to add a pore with small jitter
-    def add_pore_at(x, y, z, jitter=None):
-        if jitter is None:
-            jitter = positioning_params['jitter_strength']
-        jx = np.random.normal(0, jitter)
-        jy = np.random.normal(0, jitter)
-        # Less jitter in Z direction
-        jz = np.random.normal(
-            0, jitter * positioning_params['z_jitter_factor'])
-        # Ensure pore stays within board bounds
-        x = max(min(x + jx, x_bound), -x_bound)
-        y = max(min(y + jy, y_bound), -y_bound)
-        z = max(min(z + jz, z_bound), -z_bound)
-        return [x, y, z]
+    pore_positions = _sample_pore_positions(
+        n_pores, x_bound, y_bound, z_bound, positioning_params, rng, dtype)
 
-    # 1. Add pores in the upper region (40%)
-    top_pores = int(n_pores * 0.4)
-    for _ in tqdm(range(top_pores), desc="Top pores"):
-        # Use exponential distribution to concentrate toward top
-        z_val = z_bound * (1 - np.random.exponential(0.3))
-        z_val = min(z_bound, max(0.0, z_val))
+    return pore_positions, scaled_radii, selected_diameters
 
-        # Distribute across the x-y plane
-        x = np.random.uniform(-x_bound, x_bound)
-        y = np.random.uniform(-y_bound, y_bound)
 
-        pore_positions.append([x, y, z_val])
+def spawn_rngs(rng, n):
+    """
+    Derive independent random generators from a parent generator.
 
-    # 2. Add pores in a diagonal pattern (configurable percentage)
-    diag_pores = int(n_pores * positioning_params['diagonal_pore_ratio'])
-    for i in tqdm(range(diag_pores), desc="Diagonal pores"):
-        # Parametric position along diagonal (weighted toward top)
-        t = np.random.beta(1.5, 1.0)
+    Jobs that run in forked workers need their own generators; a shared
+    generator would be copied into every worker and repeat the same stream.
+
+    Parameters:
+    -----------
+    rng : numpy.random.Generator
+        Parent generator the child seeds are drawn from
+    n : int
+        Number of generators to create
 
-        # Create points along the diagonal
-        edge_factor = positioning_params['edge_position_factor']
-        x = x_bound * (1 - t * edge_factor) * np.random.choice([-1, 1])
-        y = y_bound * (1 - t * edge_factor) * np.random.choice([-1, 1])
-        z = z_bound * (1 - t * 0.5)
+    Returns:
+    --------
+    list of numpy.random.Generator
+        Independent child generators
+    """
+    return [np.random.default_rng(seed) for seed in rng.integers(2**63, size=n)]
 
-        pore_positions.append(add_pore_at(x, y, z))
 
-    # 3. Add pores along the edges (15%)
-    edge_pores = int(n_pores * 0.15)
-    for _ in tqdm(range(edge_pores), desc="Edge pores"):
-        edge = np.random.choice(['top-x', 'top-y', 'corner'])
-
-        edge_factor = positioning_params['edge_position_factor']
-        corner_factor = positioning_params['corner_position_factor']
-
-        if edge == 'top-x':
-            x = np.random.uniform(-x_bound, x_bound)
-            y = y_bound * (edge_factor + (1-edge_factor) * np.random.random()) * \
-                np.random.choice([-1, 1])
-            z = z_bound * (0.8 + 0.2 * np.random.random())
-        elif edge == 'top-y':
-            x = x_bound * (edge_factor + (1-edge_factor) * np.random.random()) * \
-                np.random.choice([-1, 1])
-            y = np.random.uniform(-y_bound, y_bound)
-            z = z_bound * (0.8 + 0.2 * np.random.random())
-        else:  # corner
-            x = x_bound * (corner_factor + (1-corner_factor) * np.random.random()) * \
-                np.random.choice([-1, 1])
-            y = y_bound * (corner_factor + (1-corner_factor) * np.random.random()) * \
-                np.random.choice([-1, 1])
-            z = z_bound * (corner_factor + (1-corner_factor)
-                           * np.random.random())
-
-        pore_positions.append(add_pore_at(x, y, z))
+def run_parallel_jobs(func, jobs):
+    """
+    Run independent rendering jobs, in worker processes when enabled.
 
-    # 4. Add remaining pores throughout the volume (20%)
-    remaining = n_pores - len(pore_positions)
-    for _ in tqdm(range(remaining), desc="Remaining pores"):
-        x = np.random.uniform(-x_bound, x_bound)
-        y = np.random.uniform(-y_bound, y_bound)
-        z = np.random.uniform(-z_bound, z_bound)
-        pore_positions.append([x, y, z])
+    When parallel rendering is enabled in the configuration each job runs in
+    its own forked worker, which inherits the active configuration including
+    any overrides applied by wrapper scripts. Otherwise the jobs run serially.
 
-    pore_positions = np.array(pore_positions)
+    Parameters:
+    -----------
+    func : callable
+        Function to call for each job
+    jobs : list of tuple
+        Positional arguments for each call
 
-    return pore_positions, scaled_radii, selected_diameters
+    Returns:
+    --------
+    list
+        Return value of each call, in job order
+    """
+    global _parallel_jobs
+    config = get_config()
+
+    if config.parallel_rendering and len(jobs) > 1 and 'fork' in get_all_start_methods():
+        # Workers read the function and arguments from the forked memory
+        # image and only receive a job index, so functions replaced by
+        # wrapper scripts and large arrays never need to be pickled
+        _parallel_jobs = (func, jobs)
+        try:
+            # Reseed the legacy global RNG in each worker so forked jobs do
+            # not share the parent's random stream
+            with get_context('fork').Pool(len(jobs), initializer=np.random.seed) as pool:
+                return pool.map(_run_parallel_job, range(len(jobs)))
+        finally:
+            _parallel_jobs = None
+
+    return [func(*job) for job in jobs]
+
+
+def _run_parallel_job(index):
+    """
+    Run one job registered by run_parallel_jobs inside a forked worker.
+    """
+    func, jobs = _parallel_jobs
+    return func(*jobs[index])
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Rendering timed out")
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Raise TimeoutError if the enclosed block runs longer than seconds.
+
+    Uses SIGALRM, so it must be entered from the main thread of a process;
+    render workers forked by run_parallel_jobs qualify. Where SIGALRM is not
+    available (Windows) the block runs without a time limit.
+
+    Parameters:
+    -----------
+    seconds : int
+        Time limit in whole seconds
+    """
+    if not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous_handler)
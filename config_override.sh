@@ -19,6 +19,21 @@
 
 set -e  # Exit on any error
 
+# Batch mode: run many argument sets in one invocation. Each NUL-terminated
+# record on stdin holds one argument per line; every record runs in a
+# subshell of this script, with its output followed by "===EXIT <status>===".
+if [[ "$1" == "--batch" ]]; then
+    while IFS= read -r -d '' record; do
+        mapfile -t batch_args <<< "$record"
+        set +e
+        (set -- "${batch_args[@]}"; source "${BASH_SOURCE[0]}") 2>&1
+        status=$?
+        set -e
+        echo "===EXIT ${status}==="
+    done
+    exit 0
+fi
+
 # Default values from config.py - will be overridden by command line arguments
 CONFIG_TYPE=""
 BOARD_LENGTH="160.0"           # Default: 160.0mm from config.py
@@ -115,6 +130,7 @@ OPTIONS:
     --no-cleanup               Don't cleanup temporary files after execution
     --verbose                  Enable verbose output
     --dry-run                  Show what would be changed without executing
+    --batch                    Run NUL-separated argument sets read from stdin
     --help                     Show this help message
 
 EXAMPLES:
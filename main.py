@@ -13,22 +13,52 @@ Configuration System:
 - Easy parameter modification without touching core analysis code
 """
 
+import logging
 import os
-from app import config
-from app.data_processor import load_and_clean_data, sort_by_diameter
-from app.individual_board_modeling import create_individual_sample_visualization
-from app.comparative_analysis import create_combined_three_samples_visualization
-from app.density_distribution_modeling import create_density_filled_visualization
-from app.matrix_material_modeling import create_matrix_filled_visualization
-from app.hybrid_pore_matrix_modeling import (
-    create_combined_pores_matrix_visualization,
-    create_combined_three_samples_pores_matrix_visualization
-)
-from app.config import set_configuration, get_config
-from app.config import set_configuration, get_config, get_board_dimensions
-from app.advanced_pore_analysis import create_advanced_pore_analysis
+import sys
+import numpy as np
+from app.data_processor import load_board_data
+from app.config import set_configuration, get_config, get_board_dimensions, log_configuration_summary
 import argparse
 
+logger = logging.getLogger(__name__)
+
+BANNER = "=" * 60
+BANNER_WIDE = "=" * 80
+
+# Image file written by each pipeline stage, relative to the output directory
+OUTPUT_FILES = {
+    "T1_individual": "T1_individual_clean.png",
+    "T2_individual": "T2_individual_clean.png",
+    "T3_individual": "T3_individual_clean.png",
+    "comparative": "comparative_analysis.png",
+    "density": "density_filled_clean.png",
+    "matrix": "matrix_filled_clean.png",
+    "T1_hybrid": "T1_pores_matrix_combined.png",
+    "T2_hybrid": "T2_pores_matrix_combined.png",
+    "T3_hybrid": "T3_pores_matrix_combined.png",
+    "combined_hybrid": "combined_pores_matrix_filled.png",
+    "T1_advanced": "T1_advanced_analysis.png",
+    "T2_advanced": "T2_advanced_analysis.png",
+    "T3_advanced": "T3_advanced_analysis.png",
+}
+
+# Sections of the output listing logged once the pipeline finishes,
+# naming OUTPUT_FILES keys
+OUTPUT_SUMMARY_SECTIONS = [
+    ("Individual Sample Visualizations",
+     ["T1_individual", "T2_individual", "T3_individual"]),
+    ("Combined Visualizations", ["comparative", "density", "matrix"]),
+    ("Pores + Sand Combined Visualizations",
+     ["T1_hybrid", "T2_hybrid", "T3_hybrid", "combined_hybrid"]),
+    ("Advanced Statistical Analysis",
+     ["T1_advanced", "T2_advanced", "T3_advanced"]),
+]
+
+# The visualization modules (and pyplot with its 3D toolkit) are imported
+# inside each stage below, so runs that exit early or skip a stage don't
+# pay their import cost
+
 
 def parse_args():
     """Parse command-line arguments."""
@@ -36,8 +66,9 @@ def parse_args():
         description="3D Pore Structure Modeling in CSA Cement Boards")
 
     # Advanced analysis options
-    parser.add_argument('--advanced-analysis', type=str, default='false',
-                        help='Enable advanced statistical analysis (true/false)')
+    parser.add_argument('--advanced-analysis', type=str,
+                        help='Enable advanced statistical analysis (true/false); '
+                             'defaults to the configuration setting')
 
     # Advanced visualization parameters
     parser.add_argument('--advanced-colormap', type=str,
@@ -59,9 +90,62 @@ def parse_args():
     parser.add_argument('--matrix-alpha', type=float,
                         help='Alpha transparency for matrix')
 
+    # Execution options
+    parser.add_argument('--singlecore', action='store_true',
+                        help='Render all figures in the main process (for debugging)')
+    parser.add_argument('--skip-existing', action='store_true',
+                        help='Skip outputs that are newer than the data file')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Only report warnings and errors')
+
     return parser.parse_args()
 
 
+def log_stage_header(title):
+    """Log a banner announcing the next pipeline stage."""
+    logger.info(f"\n{BANNER}\n{title}\n{BANNER}")
+
+
+def format_output_summary(include_advanced):
+    """Return the listing of output files for the final run summary."""
+    # The advanced analysis section comes last
+    sections = OUTPUT_SUMMARY_SECTIONS if include_advanced else OUTPUT_SUMMARY_SECTIONS[:-1]
+    lines = []
+    for title, keys in sections:
+        lines.append(f"\n{title}:")
+        lines.extend(f"  - {OUTPUT_FILES[key]}" for key in keys)
+    total = sum(len(keys) for _, keys in sections)
+    lines.append(f"\nTotal: {total} visualization files created")
+    return "\n".join(lines)
+
+
+def render_stage_figure(create_figure, *args):
+    """Call create_figure(*args), so different stage figures can share run_parallel_jobs."""
+    return create_figure(*args)
+
+
+def is_stale(output_file, *source_files):
+    """Return True if output_file is missing or older than any of source_files."""
+    if not os.path.exists(output_file):
+        return True
+    output_mtime = os.path.getmtime(output_file)
+    return any(output_mtime < os.path.getmtime(source) for source in source_files)
+
+
+def needs_update(output_file, skip_existing, *source_files):
+    """
+    Return False if skipping is enabled and output_file is newer than source_files.
+
+    Outputs are only compared against their input files, not the
+    configuration, so skipping is opt-in (--skip-existing); wrapper scripts
+    write other dimensions to out/ too.
+    """
+    if skip_existing and not is_stale(output_file, *source_files):
+        logger.info(f"Skipping up-to-date {output_file}")
+        return False
+    return True
+
+
 def main():
     """
     Main computational modeling function for thermal insulating board analysis.
@@ -82,133 +166,145 @@ def main():
     # - "small_specimen": Small 10±1mm diameter specimens
     CONFIG_TYPE = "default"  # <-- CHANGE THIS FOR DIFFERENT TEST SCENARIOS
 
-    # Apply the selected configuration
-    set_configuration(CONFIG_TYPE)
+    # Get arguments
+    args = parse_args()
+
+    # Progress is reported through logging so --quiet can silence it
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    logging.getLogger().setLevel(logging.WARNING if args.quiet else logging.INFO)
+
+    # Apply the selected configuration. The configuration built when
+    # app.config was imported (or installed by a wrapper script) is reused
+    # when it already matches, rather than rebuilt
+    if get_config().config_name == CONFIG_TYPE:
+        log_configuration_summary()
+    else:
+        set_configuration(CONFIG_TYPE)
     # Rename this to avoid confusion with the module name
     config_obj = get_config()
 
+    if args.singlecore:
+        config_obj.parallel_rendering = False
+
     # Display current configuration
-    print(f"\n{'='*60}")
-    print(
+    logger.info(f"\n{BANNER}")
+    logger.info(
         f"3D PORE STRUCTURE MODELING - Configuration: {config_obj.config_name.upper()}")
-    print(f"{'='*60}")
+    logger.info(BANNER)
 
     board_dims = get_board_dimensions()
-    print(
+    logger.info(
         f"Board dimensions: {board_dims[0]:.1f} × {board_dims[1]:.1f} × {board_dims[2]:.1f} mm")
-    print(
+    logger.info(
         f"Pore counts: Individual={config_obj.n_pores_individual}, Comparative={config_obj.n_pores_comparative}")
-    print(
+    logger.info(
         f"Visualization resolution: {config_obj.sphere_u_resolution}×{config_obj.sphere_v_resolution}")
-    print(f"Output format: {config_obj.output_format} at {config_obj.dpi} DPI")
-    print(f"{'='*60}\n")
+    logger.info(f"Output format: {config_obj.output_format} at {config_obj.dpi} DPI")
+    logger.info(f"{BANNER}\n")
 
     # Experimental mercury intrusion porosimetry data location
     filename = "dataset/pore_data.csv"
 
     # Check if data file exists
     if not os.path.exists(filename):
-        print(f"Error: Data file '{filename}' not found!")
-        print("Please ensure 'pore_data.csv' is in the dataset/ directory")
+        logger.error(f"Error: Data file '{filename}' not found!")
+        logger.error("Please ensure 'pore_data.csv' is in the dataset/ directory")
         return
 
-    # Load and process data
-    df = load_and_clean_data(filename)
+    # Load and process data, sorted by diameter for each sample
+    boards = load_board_data(filename)
 
-    if df is None or df.empty:
-        print("Error: Failed to load or process data!")
+    if boards is None:
+        logger.error("Error: Failed to load or process data!")
         return
 
-    print(f"Loaded data: {len(df)} samples for each thermal board")
+    (diam1, intr1), (diam2, intr2), (diam3, intr3) = boards
+    logger.info(f"Loaded data: {len(diam1)} samples for each thermal board")
+
+    # Draw one shared pool of pore diameters per board, large enough for the
+    # 800-pore advanced analysis, so every stage shows the same pore
+    # population and the sampling only runs once
+    from app.utils import sample_pore_diameters, spawn_rngs
+
+    # One generator drives all random sampling; jobs that run in parallel
+    # workers get independent child generators spawned from it
+    rng = np.random.default_rng(config_obj.random_seed)
 
-    # Extract and sort data for each sample
-    diam1, intr1 = sort_by_diameter(df["diam_T1"].values, df["int_T1"].values)
-    diam2, intr2 = sort_by_diameter(df["diam_T2"].values, df["int_T2"].values)
-    diam3, intr3 = sort_by_diameter(df["diam_T3"].values, df["int_T3"].values)
+    pool_size = max(config_obj.n_pores_individual, 800)
+    pores1, pores2, pores3 = pore_pools = tuple(
+        sample_pore_diameters(diam, intr, pool_size, board_rng)
+        for (diam, intr), board_rng in zip(boards, spawn_rngs(rng, len(boards))))
 
     # Create output directory
     output_dir = "out"
     os.makedirs(output_dir, exist_ok=True)
+    output_paths = {key: os.path.join(output_dir, name)
+                    for key, name in OUTPUT_FILES.items()}
 
     # 1. Create individual sample visualizations
-    print("\n" + "="*60)
-    print("Creating individual board models...")
-    print("="*60)
-
-    create_individual_sample_visualization(
-        diam1, intr1, "T1",
-        os.path.join(output_dir, "T1_individual_clean.png"), 'Reds')
-
-    create_individual_sample_visualization(
-        diam2, intr2, "T2",
-        os.path.join(output_dir, "T2_individual_clean.png"), 'Blues')
-
-    create_individual_sample_visualization(
-        diam3, intr3, "T3",
-        os.path.join(output_dir, "T3_individual_clean.png"), 'Oranges')
-
-    # 2. Create comparative board analysis
-    print("\n" + "="*60)
-    print("Creating comparative board analysis...")
-    print("="*60)
-
-    create_combined_three_samples_visualization(
-        diam1, intr1, diam2, intr2, diam3, intr3,
-        os.path.join(output_dir, "comparative_analysis.png"))
-
-    # 3. Create density distribution models
-    print("\n" + "="*60)
-    print("Creating density distribution models...")
-    print("="*60)
-
-    create_density_filled_visualization(
-        diam1, intr1, diam2, intr2, diam3, intr3,
-        os.path.join(output_dir, "density_filled_clean.png"))
-
-    # 4. Create matrix material models
-    print("\n" + "="*60)
-    print("Creating matrix material models...")
-    print("="*60)
-
-    create_matrix_filled_visualization(
-        diam1, intr1, diam2, intr2, diam3, intr3,
-        os.path.join(output_dir, "matrix_filled_clean.png"))
+    log_stage_header("Creating individual board models...")
+
+    from app.individual_board_modeling import create_individual_sample_visualizations
+
+    rng1, rng2, rng3 = spawn_rngs(rng, 3)
+    create_individual_sample_visualizations([job for job in [
+        (diam1, intr1, "T1", output_paths["T1_individual"], 'Reds', pores1, rng1),
+        (diam2, intr2, "T2", output_paths["T2_individual"], 'Blues', pores2, rng2),
+        (diam3, intr3, "T3", output_paths["T3_individual"], 'Oranges', pores3, rng3),
+    ] if needs_update(job[3], args.skip_existing, filename)])
+
+    # 2-4. Create comparative, density distribution and matrix material models
+    log_stage_header("Creating comparative, density and matrix models...")
+
+    from app.comparative_analysis import create_combined_three_samples_visualization
+    from app.density_distribution_modeling import create_density_filled_visualization
+    from app.matrix_material_modeling import create_matrix_filled_visualization
+    from app.utils import run_parallel_jobs
+
+    # The three whole-board figures are independent, so each is rendered as
+    # its own job with its own child generator
+    comparative_rng, density_rng, matrix_rng = spawn_rngs(rng, 3)
+    stage_jobs = []
+    if needs_update(output_paths["comparative"], args.skip_existing, filename):
+        stage_jobs.append((create_combined_three_samples_visualization,
+                           diam1, intr1, diam2, intr2, diam3, intr3,
+                           output_paths["comparative"], pore_pools, comparative_rng))
+    if needs_update(output_paths["density"], args.skip_existing, filename):
+        stage_jobs.append((create_density_filled_visualization,
+                           diam1, intr1, diam2, intr2, diam3, intr3,
+                           output_paths["density"], density_rng))
+    if needs_update(output_paths["matrix"], args.skip_existing, filename):
+        stage_jobs.append((create_matrix_filled_visualization,
+                           diam1, intr1, diam2, intr2, diam3, intr3,
+                           output_paths["matrix"], matrix_rng))
+    run_parallel_jobs(render_stage_figure, stage_jobs)
 
     # 5. Create individual hybrid pore-matrix models
-    print("\n" + "="*60)
-    print("Creating individual hybrid pore-matrix models...")
-    print("="*60)
-
-    create_combined_pores_matrix_visualization(
-        diam1, intr1, "T1",
-        os.path.join(output_dir, "T1_pores_matrix_combined.png"), 'Reds')
+    log_stage_header("Creating individual hybrid pore-matrix models...")
 
-    create_combined_pores_matrix_visualization(
-        diam2, intr2, "T2",
-        os.path.join(output_dir, "T2_pores_matrix_combined.png"), 'Blues')
+    from app.hybrid_pore_matrix_modeling import create_combined_pores_matrix_visualization
 
-    create_combined_pores_matrix_visualization(
-        diam3, intr3, "T3",
-        os.path.join(output_dir, "T3_pores_matrix_combined.png"), 'Oranges')
+    rng1, rng2, rng3 = spawn_rngs(rng, 3)
+    run_parallel_jobs(create_combined_pores_matrix_visualization, [job for job in [
+        (diam1, intr1, "T1", output_paths["T1_hybrid"], 'Reds', pores1, rng1),
+        (diam2, intr2, "T2", output_paths["T2_hybrid"], 'Blues', pores2, rng2),
+        (diam3, intr3, "T3", output_paths["T3_hybrid"], 'Oranges', pores3, rng3),
+    ] if needs_update(job[3], args.skip_existing, filename)])
 
     # 6. Create comprehensive hybrid models
-    print("\n" + "="*60)
-    print("Creating comprehensive hybrid models...")
-    print("="*60)
+    log_stage_header("Creating comprehensive hybrid models...")
 
-    create_combined_three_samples_pores_matrix_visualization(
-        diam1, intr1, diam2, intr2, diam3, intr3,
-        os.path.join(output_dir, "combined_pores_matrix_filled.png"))
+    from app.hybrid_pore_matrix_modeling import create_combined_three_samples_pores_matrix_visualization
 
-    # Get arguments
-    args = parse_args()
-
-    # Configure advanced analysis
-    current_config = get_config()
+    if needs_update(output_paths["combined_hybrid"], args.skip_existing, filename):
+        create_combined_three_samples_pores_matrix_visualization(
+            diam1, intr1, diam2, intr2, diam3, intr3,
+            output_paths["combined_hybrid"], pore_pools, rng)
 
+    # Configure advanced analysis from the command-line options
     # Set colors if provided
     if args.micropore_color or args.mesopore_color or args.macropore_color:
-        current_config.set_pore_colors(
+        config_obj.set_pore_colors(
             micropore=args.micropore_color,
             mesopore=args.mesopore_color,
             macropore=args.macropore_color
@@ -216,68 +312,46 @@ def main():
 
     # Set matrix parameters if provided
     if args.matrix_fill_color:
-        current_config.set_matrix_fill_color(args.matrix_fill_color)
+        config_obj.set_matrix_fill_color(args.matrix_fill_color)
 
     if args.matrix_alpha is not None:
-        current_config.matrix_particle_alpha = args.matrix_alpha
+        config_obj.matrix_particle_alpha = args.matrix_alpha
 
-    # Enable advanced analysis if requested
-    enable_advanced = args.advanced_analysis.lower() in ['true', 'yes', '1']
-    current_config.enable_advanced_analysis = enable_advanced
+    # Enable or disable advanced analysis if requested; otherwise keep the
+    # configuration's own setting
+    if args.advanced_analysis is not None:
+        config_obj.enable_advanced_analysis = (
+            args.advanced_analysis.lower() in ['true', 'yes', '1'])
 
     # Set advanced visualization parameters if provided
     if args.advanced_colormap:
-        current_config.advanced_colorbar_colormap = args.advanced_colormap
+        config_obj.advanced_colorbar_colormap = args.advanced_colormap
 
     if args.advanced_tick_count:
-        current_config.advanced_tick_count = args.advanced_tick_count
+        config_obj.advanced_tick_count = args.advanced_tick_count
 
     if args.advanced_bins:
-        current_config.advanced_bins_count = args.advanced_bins
+        config_obj.advanced_bins_count = args.advanced_bins
 
     # Advanced pore analysis if enabled
-    if hasattr(current_config, 'enable_advanced_analysis') and current_config.enable_advanced_analysis:
-        print("\n" + "="*60)
-        print("Creating advanced statistical pore analysis...")
-        print("="*60)
-
-        create_advanced_pore_analysis(
-            diam1, intr1, "T1",
-            os.path.join(output_dir, "T1_advanced_analysis.png"))
+    if config_obj.enable_advanced_analysis:
+        log_stage_header("Creating advanced statistical pore analysis...")
 
-        create_advanced_pore_analysis(
-            diam2, intr2, "T2",
-            os.path.join(output_dir, "T2_advanced_analysis.png"))
+        from app.advanced_pore_analysis import create_advanced_pore_analysis
 
-        create_advanced_pore_analysis(
-            diam3, intr3, "T3",
-            os.path.join(output_dir, "T3_advanced_analysis.png"))
+        rng1, rng2, rng3 = spawn_rngs(rng, 3)
+        run_parallel_jobs(create_advanced_pore_analysis, [job for job in [
+            (diam1, intr1, "T1", output_paths["T1_advanced"], pores1, rng1),
+            (diam2, intr2, "T2", output_paths["T2_advanced"], pores2, rng2),
+            (diam3, intr3, "T3", output_paths["T3_advanced"], pores3, rng3),
+        ] if needs_update(job[3], args.skip_existing, filename)])
 
     # Final summary
-    print("\n" + "="*80)
-    print("=== ALL VISUALIZATIONS COMPLETED SUCCESSFULLY! ===")
-    print("="*80)
-    print(
-        f"All output files have been saved to the '{output_dir}/' directory:")
-    print()
-    print("Individual Sample Visualizations:")
-    print("  - T1_individual_clean.png")
-    print("  - T2_individual_clean.png")
-    print("  - T3_individual_clean.png")
-    print()
-    print("Combined Visualizations:")
-    print("  - combined_three_samples_clean.png")
-    print("  - density_filled_clean.png")
-    print("  - matrix_filled_clean.png")
-    print()
-    print("Pores + Sand Combined Visualizations:")
-    print("  - T1_pores_sand_combined.png")
-    print("  - T2_pores_sand_combined.png")
-    print("  - T3_pores_sand_combined.png")
-    print("  - combined_pores_sand_filled.png")
-    print()
-    print("Total: 10 visualization files created")
-    print("="*80)
+    output_summary = format_output_summary(config_obj.enable_advanced_analysis)
+    logger.info(f"\n{BANNER_WIDE}\n=== ALL VISUALIZATIONS COMPLETED SUCCESSFULLY! ===\n"
+                f"{BANNER_WIDE}\n"
+                f"All output files have been saved to the '{output_dir}/' directory:\n"
+                f"{output_summary}\n{BANNER_WIDE}")
 
 
 if __name__ == "__main__":
@@ -5,11 +5,12 @@ with single-color pores instead of size-based coloring and no legends.
 """
 
 import main
-from app.config import MaterialConfig, CONFIG, set_configuration
+from app.config import MaterialConfig, set_configuration, get_config
+from app.dimension_overrides import SAMPLE_PORE_COLORS, apply_dim100_overrides, disable_legends
+import functools
+import logging
 import os
 import sys
-import numpy as np
-import matplotlib
 import matplotlib.pyplot as plt
 
 # Set environment variables
@@ -17,41 +18,20 @@ os.environ["DIMENSION_OVERRIDE"] = "true"
 os.environ["SINGLE_COLOR_PORES"] = "true"
 os.environ["NO_LEGENDS"] = "true"
 
-# Store original legend functions
-original_mpl_legend = plt.legend
-original_axes_legend = matplotlib.axes.Axes.legend
+# Extra patching diagnostics are only logged when PORE_DEBUG is set
+PORE_DEBUG = bool(os.environ.get("PORE_DEBUG"))
 
-# Replace with no-op versions
+# Patching runs before main() sets up logging, so use the same output here
+logging.basicConfig(stream=sys.stdout, format="%(message)s")
+logger = logging.getLogger(__name__)
+if PORE_DEBUG:
+    logger.setLevel(logging.DEBUG)
 
+# Sample names the pore creation wrappers look for among call arguments
+SAMPLE_NAMES = frozenset(SAMPLE_PORE_COLORS)
 
-def no_op_legend(*args, **kwargs):
-    return None
-
-
-# Apply the patches
-plt.legend = no_op_legend
-matplotlib.axes.Axes.legend = no_op_legend
-
-# Patch savefig to remove any legends that might still be created
-original_savefig = plt.savefig
-
-
-def patched_savefig(fname, *args, **kwargs):
-    # Get the current figure
-    fig = plt.gcf()
-
-    # Remove any legends from all axes
-    for ax in fig.axes:
-        legend = ax.get_legend()
-        if legend is not None:
-            legend.remove()
-
-    # Call the original savefig
-    return original_savefig(fname, *args, **kwargs)
-
-
-# Apply the patch
-plt.savefig = patched_savefig
+# Block legend creation everywhere
+disable_legends()
 
 print("Applying dimension override (100×100×100mm) with single-color pores and no legends...")
 
@@ -65,86 +45,23 @@ def custom_100x100x100_color0_config(self):
     # First call original to get all default settings
     original_load_default_config(self)
 
-    # Then override specific dimensions and related settings
-    self.board_length_mm = 100.0
-    self.board_width_mm = 100.0
-    self.board_thickness_mm = 100.0
-
-    # Update normalized coordinate scaling for new cubic shape
-    self.length_scale = 1.25
-    self.width_scale = 1.25
-    self.thickness_scale = 1.25
-
-    # Update aspect ratio for cubic shape (all equal)
-    thickness_ratio = 1.0  # Equal dimensions for cube
-    self.aspect_ratio = [1, 1, thickness_ratio]
-
-    # Adjust visualization limits for the cubic shape
-    self.x_limits = (-1.5, 1.5)
-    self.y_limits = (-1.5, 1.5)
-    self.z_limits = (-1.5, 1.5)
-
-    # Adjust matrix fill boundaries
-    self.matrix_fill_x_bounds = (-1.2, 1.2)
-    self.matrix_fill_y_bounds = (-1.2, 1.2)
-    self.matrix_fill_z_bounds = (-1.2, 1.2)
-
-    # Update normalization constants for particle distribution
-    self.matrix_length_norm = 1.2
-    self.matrix_width_norm = 1.2
-
-    # Adjust default coordinate bounds for particle placement
-    self.default_x_bounds = (-1.2, 1.2)
-    self.default_y_bounds = (-1.2, 1.2)
-    self.default_z_bounds = (-1.2, 1.2)
-
-    # Update camera position for cubic view
-    self.camera_position = np.array([2.0, 2.0, 2.0])
-
-    # Adjust view angle for better cubic board visualization
-    self.view_elevation = 35
-    self.view_azimuth = 45
-
-    # Calculate the volume ratio compared to default (160×160×40)
-    default_volume = 160 * 160 * 40
-    new_volume = 100 * 100 * 100
-    volume_ratio = new_volume / default_volume  # About 1.56
-
-    # Scale pore counts based on volume
-    self.n_pores_individual = int(600 * volume_ratio)
-    self.n_pores_comparative = int(400 * volume_ratio)
-    self.n_pores_density = int(500 * volume_ratio)
-    self.n_pores_matrix = int(800 * volume_ratio)
-    self.n_pores_hybrid = int(800 * volume_ratio)
-
-    # Update particle counts for the new dimensions
-    self.base_particles_matrix = int(15000 * volume_ratio)
-    self.base_particles_hybrid_main = int(8000 * volume_ratio)
-    self.base_particles_hybrid_combined = int(5000 * volume_ratio)
+    # Apply the 100×100×100mm cube geometry and scaled counts
+    apply_dim100_overrides(self)
 
     # Override visualization settings to use single color
 
-    # CRITICAL: Define a hook to override plotting in all visualization modules
-    def universal_plot_override(fig):
-        """Function to be called at the end of any visualization function"""
-        # Remove legends from all axes
-        for ax in fig.axes:
-            legend = ax.get_legend()
-            if legend is not None:
-                legend.remove()
-        return fig
-
-    # Add the hook to the configuration
-    self.post_plot_hook = universal_plot_override
-
     # Make uniform colors of pores by size in all plots
     # Instead of uniform blue, use sample-specific colors like combined_pores_matrix_filled.png
 
     # Set colors for different samples - matching combined visualization pattern
-    self.sample_pore_colors = {
-        'T1': "#D62728",  # Red for T1 (matches matrix fill color pattern)
-        'T2': "#1F77B4",  # Blue for T2 (matches matrix fill color pattern)
-        'T3': "#FF7F0E"   # Orange for T3 (matches matrix fill color pattern)
+    self.sample_pore_colors = dict(SAMPLE_PORE_COLORS)
+
+    # Size-class colors forced for each sample, built once so the render
+    # wrappers below apply them with a single dict update
+    self.sample_color_overrides = {
+        sample: dict.fromkeys(
+            ('micropore_color', 'mesopore_color', 'macropore_color'), color)
+        for sample, color in self.sample_pore_colors.items()
     }
 
     # Override micropore/mesopore/macropore colors to use sample-specific colors
@@ -193,17 +110,8 @@ def custom_100x100x100_color0_config(self):
 # Replace the _load_default_config method with our custom implementation
 MaterialConfig._load_default_config = custom_100x100x100_color0_config
 
-# Make sure we force a reload of the configuration with our monkey patched method
-if hasattr(CONFIG, '_config_name'):
-    # Create a fresh instance with our patched method
-    new_config = MaterialConfig(CONFIG._config_name)
-    # Copy the new instance attributes to the existing CONFIG
-    for attr_name in dir(new_config):
-        if not attr_name.startswith('_'):
-            setattr(CONFIG, attr_name, getattr(new_config, attr_name))
-else:
-    # Replace CONFIG with a fresh instance
-    set_configuration("default")  # This will use our patched method
+# Replace CONFIG with a fresh instance built by our patched method
+set_configuration("default")
 
 # Make sure no one can create a legend
 
@@ -213,6 +121,10 @@ def block_legend_creation(*args, **kwargs):
     return None
 
 
+class SkipPatching(Exception):
+    """Raised when the modules were already patched by an earlier run."""
+
+
 # Apply more patches to specifically target the functions we need
 try:
     # Patch individual_board_modeling.py
@@ -223,11 +135,27 @@ try:
     # Try to find and disable any legend creation in hybrid_pore_matrix_modeling
     import app.hybrid_pore_matrix_modeling as hpm
 
+    # Patch the hybrid module only once per process, so re-running this
+    # script (runpy, importlib.reload) does not stack wrapper on wrapper
+    if getattr(hpm, '_pore_color_patched', False):
+        raise SkipPatching()
+
+    # Classify the hybrid module's public functions in a single pass over its
+    # namespace: everything callable is listed, and pore creation functions
+    # are collected for the color override wrappers below
+    hpm_functions = {}
+    pore_creation_functions = []
+    for attr_name, attr_value in sorted(vars(hpm).items()):
+        if attr_name.startswith('_') or not callable(attr_value):
+            continue
+        hpm_functions[attr_name] = attr_value
+        if 'pore' in attr_name.lower() and 'create' in attr_name.lower():
+            pore_creation_functions.append(attr_name)
+
     # DEBUGGING: Let's see what functions exist in the hybrid module
-    print("[DEBUG] Functions in hybrid_pore_matrix_modeling:")
-    for attr_name in dir(hpm):
-        if not attr_name.startswith('_') and callable(getattr(hpm, attr_name)):
-            print(f"  - {attr_name}")
+    logger.debug("Functions in hybrid_pore_matrix_modeling:")
+    for attr_name in hpm_functions:
+        logger.debug(f"  - {attr_name}")
 
     # CRITICAL: Find and patch the actual function that creates the individual matrix visualizations
     # Look for variations of the function name
@@ -239,30 +167,38 @@ try:
         'create_hybrid_pore_matrix_model',
         'create_individual_hybrid_model'
     ]:
-        if hasattr(hpm, possible_name):
+        if possible_name in hpm_functions:
             matrix_viz_function = possible_name
-            print(
-                f"[DEBUG] Found matrix visualization function: {possible_name}")
+            logger.debug(
+                f"Found matrix visualization function: {possible_name}")
             break
 
     if matrix_viz_function:
-        original_matrix_func = getattr(hpm, matrix_viz_function)
+        original_matrix_func = hpm_functions[matrix_viz_function]
 
-        def force_sample_colors(sample_name, *args, **kwargs):
-            print(f"[DEBUG] Creating matrix visualization for {sample_name}")
-
-            # FORCE the sample colors before calling the function
-            if hasattr(CONFIG, 'sample_pore_colors') and sample_name in CONFIG.sample_pore_colors:
-                target_color = CONFIG.sample_pore_colors[sample_name]
-                print(
-                    f"[DEBUG] Target color for {sample_name}: {target_color}")
+        # One single-color property cycle per sample, built once up front
+        sample_cyclers = {
+            sample: plt.cycler('color', [color] * 10)
+            for sample, color in SAMPLE_PORE_COLORS.items()
+        }
 
-                # Override EVERYTHING related to pore colors
-                CONFIG.micropore_color = target_color
-                CONFIG.mesopore_color = target_color
-                CONFIG.macropore_color = target_color
-                CONFIG.default_pore_color = target_color
-                CONFIG.pore_color = target_color
+        @functools.wraps(original_matrix_func)
+        def force_sample_colors(sample_name, *args, **kwargs):
+            logger.debug(f"Creating matrix visualization for {sample_name}")
+
+            # FORCE the sample colors on the active configuration before
+            # calling the function
+            current_config = get_config()
+            original_cycler = None
+            color_overrides = getattr(
+                current_config, 'sample_color_overrides', {}).get(sample_name)
+            if color_overrides:
+                target_color = current_config.sample_pore_colors[sample_name]
+                logger.debug(
+                    f"Target color for {sample_name}: {target_color}")
+
+                # Override every size-class pore color
+                current_config.__dict__.update(color_overrides)
 
                 # Also try to override any hardcoded colors in the module
                 if hasattr(hpm, 'PORE_COLOR'):
@@ -271,72 +207,68 @@ try:
                     hpm.DEFAULT_COLOR = target_color
 
                 # Override matplotlib colors temporarily
-                import matplotlib.pyplot as plt
-                original_colors = plt.rcParams['axes.prop_cycle'].by_key()[
-                    'color']
-                plt.rcParams['axes.prop_cycle'] = plt.cycler(
-                    'color', [target_color] * 10)
+                original_cycler = plt.rcParams['axes.prop_cycle']
+                plt.rcParams['axes.prop_cycle'] = sample_cyclers[sample_name]
 
             # Call the original function
             result = original_matrix_func(sample_name, *args, **kwargs)
 
             # Restore matplotlib colors
-            try:
-                plt.rcParams['axes.prop_cycle'] = plt.cycler(
-                    'color', original_colors)
-            except:
-                pass
+            if original_cycler is not None:
+                plt.rcParams['axes.prop_cycle'] = original_cycler
 
-            # Remove legends
+            # Remove legends by dropping the references: they are never drawn
+            # again, so the artist teardown of Legend.remove() is not needed
             if hasattr(result, 'axes'):
                 for ax in result.axes:
-                    if ax.get_legend() is not None:
-                        ax.get_legend().remove()
+                    ax.legend_ = None
+                if hasattr(result, 'legends'):
+                    result.legends.clear()
 
             return result
 
         # Replace the function
         setattr(hpm, matrix_viz_function, force_sample_colors)
 
-    # ALSO: Find and patch any pore creation functions
-    pore_creation_functions = []
-    for attr_name in dir(hpm):
-        if 'pore' in attr_name.lower() and 'create' in attr_name.lower() and callable(getattr(hpm, attr_name)):
-            pore_creation_functions.append(attr_name)
-            print(f"[DEBUG] Found pore creation function: {attr_name}")
-
+    # ALSO: Patch any pore creation functions
     for func_name in pore_creation_functions:
+        logger.debug(f"Found pore creation function: {func_name}")
+
+        # Read the module attribute rather than the snapshot so a function
+        # already replaced above is wrapped on top of its replacement
         original_func = getattr(hpm, func_name)
 
         def make_color_override_wrapper(orig_func, name):
+            @functools.wraps(orig_func)
             def wrapper(*args, **kwargs):
                 # Try to detect sample name from arguments
                 sample_name = None
                 for arg in args:
-                    if isinstance(arg, str) and arg in ['T1', 'T2', 'T3']:
+                    if isinstance(arg, str) and arg in SAMPLE_NAMES:
                         sample_name = arg
                         break
 
-                if sample_name and hasattr(CONFIG, 'sample_pore_colors'):
-                    target_color = CONFIG.sample_pore_colors[sample_name]
-                    print(
-                        f"[DEBUG] Overriding colors in {name} for {sample_name}: {target_color}")
+                # Read the active configuration at call time
+                current_config = get_config()
+                color_overrides = getattr(
+                    current_config, 'sample_color_overrides', {}).get(sample_name)
+                if color_overrides:
+                    target_color = current_config.sample_pore_colors[sample_name]
+                    logger.debug(
+                        f"Overriding colors in {name} for {sample_name}: {target_color}")
 
-                    # Set all possible color attributes
-                    for color_attr in ['micropore_color', 'mesopore_color', 'macropore_color',
-                                       'default_pore_color', 'pore_color']:
-                        if hasattr(CONFIG, color_attr):
-                            setattr(CONFIG, color_attr, target_color)
+                    # Set every size-class pore color
+                    current_config.__dict__.update(color_overrides)
 
                 result = orig_func(*args, **kwargs)
 
                 # If result is a list of pores, force their colors
                 if isinstance(result, list) and sample_name:
-                    target_color = CONFIG.sample_pore_colors[sample_name]
+                    target_color = current_config.sample_pore_colors[sample_name]
                     for pore in result:
                         if isinstance(pore, dict):
                             pore['color'] = target_color
-                            pore['alpha'] = getattr(CONFIG, 'pore_alpha', 0.9)
+                            pore['alpha'] = getattr(current_config, 'pore_alpha', 0.9)
 
                 return result
             return wrapper
@@ -344,35 +276,13 @@ try:
         setattr(hpm, func_name, make_color_override_wrapper(
             original_func, func_name))
 
+    hpm._pore_color_patched = True
+
+except SkipPatching:
+    logger.debug("hybrid_pore_matrix_modeling already patched, skipping")
 except Exception as e:
     print(f"Note: Some functions couldn't be patched: {e}")
     print("Using matplotlib-level legend blocking instead.")
 
-# Function to remove all legends from all figures
-
-
-def remove_all_legends():
-    """Function to remove all legends from all figures"""
-    for fig_num in plt.get_fignums():
-        fig = plt.figure(fig_num)
-        for ax in fig.axes:
-            if ax.get_legend() is not None:
-                ax.get_legend().remove()
-
-
-# Patch plt.show to remove legends before showing
-original_show = plt.show
-
-
-def show_without_legends(*args, **kwargs):
-    remove_all_legends()
-    return original_show(*args, **kwargs)
-
-
-plt.show = show_without_legends
-
-# Set advanced analysis to True for more detailed visualizations
-CONFIG.set_advanced_analysis(True)
-
 # Execute the main function from the main module
 sys.exit(main.main())
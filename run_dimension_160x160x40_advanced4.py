@@ -5,7 +5,7 @@ advanced analysis v4, and custom colorbar using pore colors.
 """
 
 import main
-from app.config import MaterialConfig, CONFIG, set_configuration
+from app.config import MaterialConfig, set_configuration, get_config
 import os
 import sys
 import numpy as np
@@ -20,98 +20,103 @@ os.environ["ADVANCED_ANALYSIS"] = "true"
 
 print("Applying dimension override (160×160×40mm) with multi-color pores, advanced analysis v4, and custom colorbar...")
 
-# Store original function
-original_load_default_config = MaterialConfig._load_default_config
-
-
-def custom_160x160x40_advanced4_config(self):
-    # First call original to get all default settings
-    original_load_default_config(self)
-
+# Settings applied on top of the defaults, built once at import
+ADVANCED4_OVERRIDES = {
     # Apply 160×160×40mm dimensions (default dimensions)
-    self.board_length_mm = 160.0
-    self.board_width_mm = 160.0
-    self.board_thickness_mm = 40.0
+    'board_length_mm': 160.0,
+    'board_width_mm': 160.0,
+    'board_thickness_mm': 40.0,
 
     # Update coordinate scaling (standard aspect ratio)
-    self.length_scale = 2.0
-    self.width_scale = 2.0
-    self.thickness_scale = 0.5
-    self.aspect_ratio = [4, 4, 1]
+    'length_scale': 2.0,
+    'width_scale': 2.0,
+    'thickness_scale': 0.5,
+    'aspect_ratio': [4, 4, 1],
 
     # Adjust visualization limits (expanded to prevent cutoff)
-    self.x_limits = (-2.2, 2.2)
-    self.y_limits = (-2.2, 2.2)
-    self.z_limits = (-0.6, 0.6)
+    'x_limits': (-2.2, 2.2),
+    'y_limits': (-2.2, 2.2),
+    'z_limits': (-0.6, 0.6),
 
     # Matrix boundaries (slightly smaller than limits to ensure full visibility)
-    self.matrix_fill_x_bounds = (-2.0, 2.0)
-    self.matrix_fill_y_bounds = (-2.0, 2.0)
-    self.matrix_fill_z_bounds = (-0.5, 0.5)
+    'matrix_fill_x_bounds': (-2.0, 2.0),
+    'matrix_fill_y_bounds': (-2.0, 2.0),
+    'matrix_fill_z_bounds': (-0.5, 0.5),
 
     # Particle distribution (matching matrix bounds)
-    self.matrix_length_norm = 2.0
-    self.matrix_width_norm = 2.0
-    self.default_x_bounds = (-2.0, 2.0)
-    self.default_y_bounds = (-2.0, 2.0)
-    self.default_z_bounds = (-0.5, 0.5)
+    'matrix_length_norm': 2.0,
+    'matrix_width_norm': 2.0,
+    'default_x_bounds': (-2.0, 2.0),
+    'default_y_bounds': (-2.0, 2.0),
+    'default_z_bounds': (-0.5, 0.5),
 
     # Camera and view settings (adjusted for better full view)
-    self.camera_position = np.array([3.0, 3.0, 1.2])
-    self.view_elevation = 25
-    self.view_azimuth = 50
+    'camera_position': np.array([3.0, 3.0, 1.2]),
+    'view_elevation': 25,
+    'view_azimuth': 50,
 
     # Standard pore counts (default volume)
-    self.n_pores_individual = 600
-    self.n_pores_comparative = 400
-    self.n_pores_density = 500
-    self.n_pores_matrix = 800
-    self.n_pores_hybrid = 800
+    'n_pores_individual': 600,
+    'n_pores_comparative': 400,
+    'n_pores_density': 500,
+    'n_pores_matrix': 800,
+    'n_pores_hybrid': 800,
 
     # Standard particle counts
-    self.base_particles_matrix = 15000
-    self.base_particles_hybrid_main = 8000
-    self.base_particles_hybrid_combined = 5000
+    'base_particles_matrix': 15000,
+    'base_particles_hybrid_main': 8000,
+    'base_particles_hybrid_combined': 5000,
 
     # MULTI-COLOR PORE SETTINGS (size-based with custom colorbar)
-    self.micropore_color = "#FF1493"  # Deep pink (Micropores)
-    self.mesopore_color = "#FFFF00"   # Bright yellow (Mesopores)
-    self.macropore_color = "#00FFFF"  # Bright cyan (Macropores)
+    'micropore_color': "#FF1493",  # Deep pink (Micropores)
+    'mesopore_color': "#FFFF00",   # Bright yellow (Mesopores)
+    'macropore_color': "#00FFFF",  # Bright cyan (Macropores)
 
     # Custom colorbar settings using pore colors
-    self.use_custom_colorbar = True
-    self.custom_colorbar_colors = [
-        self.micropore_color, self.mesopore_color, self.macropore_color]
-    self.custom_colorbar_labels = ['Micropores', 'Mesopores', 'Macropores']
+    'use_custom_colorbar': True,
+    'custom_colorbar_colors': ["#FF1493", "#FFFF00", "#00FFFF"],
+    'custom_colorbar_labels': ['Micropores', 'Mesopores', 'Macropores'],
 
     # ADVANCED ANALYSIS SETTINGS (from advanced configuration)
-    self.enable_advanced_analysis = True
-    self.advanced_analysis = True
-    self.advanced_colormap = "custom"  # Use custom colormap instead of jet
-    self.advanced_tick_count = 8
-    self.advanced_bins = 30
+    'enable_advanced_analysis': True,
+    'advanced_analysis': True,
+    'advanced_colormap': "custom",  # Use custom colormap instead of jet
+    'advanced_tick_count': 8,
+    'advanced_bins': 30,
 
     # Enhanced advanced analysis parameters
-    self.advanced_stats_position = (0.5, 0.95)
-    self.advanced_colorbar_colormap = 'custom'
-    self.advanced_colorbar_position = 'right'
-    self.advanced_plot_padding = 0.15
-    self.advanced_colorbar_formatter = '%.2e'
+    'advanced_stats_position': (0.5, 0.95),
+    'advanced_colorbar_colormap': 'custom',
+    'advanced_colorbar_position': 'right',
+    'advanced_plot_padding': 0.15,
+    'advanced_colorbar_formatter': '%.2e',
 
     # Matrix settings to match advanced
-    self.matrix_fill_color = "#333333"
-    self.matrix_alpha = 0.1
+    'matrix_fill_color': "#333333",
+    'matrix_alpha': 0.1,
 
     # Enable legends for size-based colors
-    self.show_legends = False  # Disable legends for advanced4
-    self.show_legend = False
-    self.enable_legends = False
+    'show_legends': False,  # Disable legends for advanced4
+    'show_legend': False,
+    'enable_legends': False,
 
     # Visualization settings
-    self.pore_alpha = 1.0
-    self.alpha = 1.0
-    self.dpi = 300
-    self.figure_size = (12, 8)  # Landscape for flat board
+    'pore_alpha': 1.0,
+    'alpha': 1.0,
+    'dpi': 300,
+    'figure_size': (12, 8),  # Landscape for flat board
+}
+
+# Store original function
+original_load_default_config = MaterialConfig._load_default_config
+
+
+def custom_160x160x40_advanced4_config(self):
+    # First call original to get all default settings
+    original_load_default_config(self)
+
+    # Apply the 160×160×40mm advanced v4 settings
+    self.__dict__.update(ADVANCED4_OVERRIDES)
 
     print("\nSimple Pore Analysis - Advanced v4 with Multi-Color Pores and Custom Colorbar")
     print("=============================================================================")
@@ -131,103 +136,51 @@ def custom_160x160x40_advanced4_config(self):
 # Replace the config method
 MaterialConfig._load_default_config = custom_160x160x40_advanced4_config
 
+# Rebuild the configuration with the patched method; main() reuses it
+set_configuration("default")
+
 # Execute main first
 result = main.main()
 
 # After main execution, manually create the advanced analysis files with custom colorbar
 try:
-    from app.advanced_pore_analysis import create_advanced_pore_analysis
-    from app.data_processor import load_and_clean_data
+    from app.advanced_pore_analysis import render_advanced_sample
+    from app.data_processor import load_board_data
+    from app.utils import run_parallel_jobs, spawn_rngs
 
     print("[DEBUG] Manually generating advanced analysis v4 files...")
 
-    # Load the data with the correct filename
+    # main.main() has already parsed the data file and cached the sorted
+    # board arrays next to it, so this reload reads the cache, not the CSV
     data_filename = "dataset/pore_data.csv"
-    data = load_and_clean_data(data_filename)
-    if data is not None:
-        print(f"[DEBUG] Data loaded, type: {type(data)}, shape: {data.shape}")
-        print(f"[DEBUG] Data columns: {list(data.columns)}")
-
-        # Extract data for each sample from the DataFrame
-        try:
-            if 'diam_T1' in data.columns and 'int_T1' in data.columns:
-                diam1 = data['diam_T1'].values
-                intr1 = data['int_T1'].values
-                diam2 = data['diam_T2'].values
-                intr2 = data['int_T2'].values
-                diam3 = data['diam_T3'].values
-                intr3 = data['int_T3'].values
-                print(
-                    "[DEBUG] Successfully extracted data using diam_T1/int_T1 pattern")
-            else:
-                # Fallback to column indices
-                columns = list(data.columns)
-                diam1 = data[columns[0]].values
-                intr1 = data[columns[1]].values
-                diam2 = data[columns[3]].values
-                intr2 = data[columns[4]].values
-                diam3 = data[columns[6]].values
-                intr3 = data[columns[7]].values
-                print(
-                    f"[DEBUG] Extracted data from columns: {[columns[0], columns[1], columns[3], columns[4], columns[6], columns[7]]}")
-        except Exception as e:
-            print(f"[DEBUG] Failed to extract data from DataFrame: {e}")
-            raise
-
-        # Generate advanced analysis for each sample with multi-color pores
-        samples = [
-            (diam1, intr1, 'T1'),
-            (diam2, intr2, 'T2'),
-            (diam3, intr3, 'T3')
-        ]
-
-        for diam, intr, sample_name in samples:
-            output_file = f"out/{sample_name}_advanced_v4_analysis.png"
-            print(f"[DEBUG] Creating advanced analysis v4 for {sample_name}")
-            print(
-                f"[DEBUG] Data shapes - diam: {len(diam)}, intr: {len(intr)}")
-
-            # Ensure multi-color pore settings are active (not single-color)
-            CONFIG.micropore_color = "#FF0000"  # Red
-            CONFIG.mesopore_color = "#00FF00"   # Green
-            CONFIG.macropore_color = "#0000FF"  # Blue
-
-            # Remove any sample-specific color override for this version
-            if hasattr(CONFIG, 'sample_pore_colors'):
-                delattr(CONFIG, 'sample_pore_colors')
-
-            print(
-                f"[DEBUG] Using multi-color pores for {sample_name}: Red/Green/Blue")
-
-            # Create the advanced analysis with timeout protection
-            try:
-                import signal
-
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("Advanced analysis rendering timeout")
-
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(120)
-
-                print(
-                    f"[DEBUG] Starting advanced analysis v4 rendering for {sample_name}...")
-                create_advanced_pore_analysis(
-                    diam, intr, sample_name, output_file)
-
-                signal.alarm(0)
-
-            except TimeoutError:
-                print(
-                    f"[DEBUG] Advanced analysis v4 for {sample_name} timed out, skipping")
-                continue
-            except Exception as rendering_error:
-                print(
-                    f"[DEBUG] Advanced analysis v4 rendering failed for {sample_name}: {rendering_error}")
-                continue
-            finally:
-                signal.alarm(0)
-
-            print(f"[DEBUG] Advanced analysis v4 saved: {output_file}")
+    boards = load_board_data(data_filename)
+    if boards is not None:
+        (diam1, intr1), (diam2, intr2), (diam3, intr3) = boards
+        print(f"[DEBUG] Data loaded: {len(diam1)} rows per sample")
+
+        # Ensure multi-color pore settings are active (not single-color)
+        current_config = get_config()
+        current_config.micropore_color = "#FF0000"  # Red
+        current_config.mesopore_color = "#00FF00"   # Green
+        current_config.macropore_color = "#0000FF"  # Blue
+
+        # Remove any sample-specific color override for this version
+        if hasattr(current_config, 'sample_pore_colors'):
+            delattr(current_config, 'sample_pore_colors')
+        print("[DEBUG] Using multi-color pores: Red/Green/Blue")
+
+        # Give each sample its own child generator, as main.py does for its
+        # advanced stage
+        rng1, rng2, rng3 = spawn_rngs(
+            np.random.default_rng(get_config().random_seed), 3)
+
+        # Generate advanced analysis for each sample with multi-color pores;
+        # the samples are independent, so they render in parallel workers
+        run_parallel_jobs(render_advanced_sample, [
+            (diam1, intr1, 'T1', "out/T1_advanced_v4_analysis.png", rng1, 'v4'),
+            (diam2, intr2, 'T2', "out/T2_advanced_v4_analysis.png", rng2, 'v4'),
+            (diam3, intr3, 'T3', "out/T3_advanced_v4_analysis.png", rng3, 'v4')
+        ])
     else:
         print("[DEBUG] Could not load data for advanced analysis v4")
 
@@ -5,7 +5,7 @@ advanced analysis v3, and custom colorbar using pore colors.
 """
 
 import main
-from app.config import MaterialConfig, CONFIG, set_configuration
+from app.config import MaterialConfig, set_configuration, get_config
 import os
 import sys
 import numpy as np
@@ -20,6 +20,21 @@ os.environ["ADVANCED_ANALYSIS"] = "true"
 
 print("Applying dimension override (160×160×80mm) with multi-color pores, advanced analysis v3, and custom colorbar...")
 
+# Volume ratio of the 160×160×80mm board to the default 160×160×40mm board
+VOLUME_RATIO = (160 * 160 * 80) / (160 * 160 * 40)
+
+# Pore and particle counts scaled from the defaults, computed once at import
+ADVANCED3_SCALED_COUNTS = {
+    'n_pores_individual': int(600 * VOLUME_RATIO),
+    'n_pores_comparative': int(400 * VOLUME_RATIO),
+    'n_pores_density': int(500 * VOLUME_RATIO),
+    'n_pores_matrix': int(800 * VOLUME_RATIO),
+    'n_pores_hybrid': int(800 * VOLUME_RATIO),
+    'base_particles_matrix': int(15000 * VOLUME_RATIO),
+    'base_particles_hybrid_main': int(8000 * VOLUME_RATIO),
+    'base_particles_hybrid_combined': int(5000 * VOLUME_RATIO),
+}
+
 # Store original function
 original_load_default_config = MaterialConfig._load_default_config
 
@@ -61,21 +76,8 @@ def custom_160x160x80_advanced3_config(self):
     self.view_elevation = 20
     self.view_azimuth = 45
 
-    # Scale pore counts based on volume
-    default_volume = 160 * 160 * 40
-    new_volume = 160 * 160 * 80
-    volume_ratio = new_volume / default_volume
-
-    self.n_pores_individual = int(600 * volume_ratio)
-    self.n_pores_comparative = int(400 * volume_ratio)
-    self.n_pores_density = int(500 * volume_ratio)
-    self.n_pores_matrix = int(800 * volume_ratio)
-    self.n_pores_hybrid = int(800 * volume_ratio)
-
-    # Particle counts
-    self.base_particles_matrix = int(15000 * volume_ratio)
-    self.base_particles_hybrid_main = int(8000 * volume_ratio)
-    self.base_particles_hybrid_combined = int(5000 * volume_ratio)
+    # Scale pore and particle counts to the doubled thickness
+    self.__dict__.update(ADVANCED3_SCALED_COUNTS)
 
     # MULTI-COLOR PORE SETTINGS (size-based with custom colorbar)
     self.micropore_color = "#FF1493"  # Deep pink (Micropores)
@@ -135,117 +137,51 @@ def custom_160x160x80_advanced3_config(self):
 # Replace the config method
 MaterialConfig._load_default_config = custom_160x160x80_advanced3_config
 
-# Force reload configuration
-if hasattr(CONFIG, '_config_name'):
-    new_config = MaterialConfig(CONFIG._config_name)
-    for attr_name in dir(new_config):
-        if not attr_name.startswith('_'):
-            setattr(CONFIG, attr_name, getattr(new_config, attr_name))
-else:
-    set_configuration("default")
-
-# Enable advanced analysis
-CONFIG.set_advanced_analysis(True)
-print(
-    f"[DEBUG] Advanced analysis v3 enabled: {getattr(CONFIG, 'enable_advanced_analysis', False)}")
+# Force reload configuration with the patched method
+set_configuration("default")
 
 # Execute main first
 result = main.main()
 
 # After main execution, manually create the advanced analysis files with custom colorbar
 try:
-    from app.advanced_pore_analysis import create_advanced_pore_analysis
-    from app.data_processor import load_and_clean_data
+    from app.advanced_pore_analysis import render_advanced_sample
+    from app.data_processor import load_board_data
+    from app.utils import run_parallel_jobs, spawn_rngs
 
     print("[DEBUG] Manually generating advanced analysis v3 files...")
 
-    # Load the data with the correct filename
+    # main.main() has already parsed the data file and cached the sorted
+    # board arrays next to it, so this reload reads the cache, not the CSV
     data_filename = "dataset/pore_data.csv"
-    data = load_and_clean_data(data_filename)
-    if data is not None:
-        print(f"[DEBUG] Data loaded, type: {type(data)}, shape: {data.shape}")
-        print(f"[DEBUG] Data columns: {list(data.columns)}")
-
-        # Extract data for each sample from the DataFrame
-        try:
-            if 'diam_T1' in data.columns and 'int_T1' in data.columns:
-                diam1 = data['diam_T1'].values
-                intr1 = data['int_T1'].values
-                diam2 = data['diam_T2'].values
-                intr2 = data['int_T2'].values
-                diam3 = data['diam_T3'].values
-                intr3 = data['int_T3'].values
-                print(
-                    "[DEBUG] Successfully extracted data using diam_T1/int_T1 pattern")
-            else:
-                # Fallback to column indices
-                columns = list(data.columns)
-                diam1 = data[columns[0]].values
-                intr1 = data[columns[1]].values
-                diam2 = data[columns[3]].values
-                intr2 = data[columns[4]].values
-                diam3 = data[columns[6]].values
-                intr3 = data[columns[7]].values
-                print(
-                    f"[DEBUG] Extracted data from columns: {[columns[0], columns[1], columns[3], columns[4], columns[6], columns[7]]}")
-        except Exception as e:
-            print(f"[DEBUG] Failed to extract data from DataFrame: {e}")
-            raise
-
-        # Generate advanced analysis for each sample with multi-color pores
-        samples = [
-            (diam1, intr1, 'T1'),
-            (diam2, intr2, 'T2'),
-            (diam3, intr3, 'T3')
-        ]
-
-        for diam, intr, sample_name in samples:
-            output_file = f"out/{sample_name}_advanced_v3_analysis.png"
-            print(f"[DEBUG] Creating advanced analysis v3 for {sample_name}")
-            print(
-                f"[DEBUG] Data shapes - diam: {len(diam)}, intr: {len(intr)}")
-
-            # Ensure multi-color pore settings are active (not single-color)
-            CONFIG.micropore_color = "#FF0000"  # Red
-            CONFIG.mesopore_color = "#00FF00"   # Green
-            CONFIG.macropore_color = "#0000FF"  # Blue
-
-            # Remove any sample-specific color override for this version
-            if hasattr(CONFIG, 'sample_pore_colors'):
-                delattr(CONFIG, 'sample_pore_colors')
-
-            print(
-                f"[DEBUG] Using multi-color pores for {sample_name}: Red/Green/Blue")
-
-            # Create the advanced analysis with timeout protection
-            try:
-                import signal
-
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("Advanced analysis rendering timeout")
-
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(120)
-
-                print(
-                    f"[DEBUG] Starting advanced analysis v3 rendering for {sample_name}...")
-                create_advanced_pore_analysis(
-                    diam, intr, sample_name, output_file)
-
-                signal.alarm(0)
-
-            except TimeoutError:
-                print(
-                    f"[DEBUG] Advanced analysis v3 for {sample_name} timed out, skipping")
-                continue
-            except Exception as rendering_error:
-                print(
-                    f"[DEBUG] Advanced analysis v3 rendering failed for {sample_name}: {rendering_error}")
-                continue
-            finally:
-                signal.alarm(0)
-
-            print(f"[DEBUG] Advanced analysis v3 saved: {output_file}")
+    boards = load_board_data(data_filename)
+    if boards is not None:
+        (diam1, intr1), (diam2, intr2), (diam3, intr3) = boards
+        print(f"[DEBUG] Data loaded: {len(diam1)} rows per sample")
+
+        # Ensure multi-color pore settings are active (not single-color)
+        current_config = get_config()
+        current_config.micropore_color = "#FF0000"  # Red
+        current_config.mesopore_color = "#00FF00"   # Green
+        current_config.macropore_color = "#0000FF"  # Blue
+
+        # Remove any sample-specific color override for this version
+        if hasattr(current_config, 'sample_pore_colors'):
+            delattr(current_config, 'sample_pore_colors')
+        print("[DEBUG] Using multi-color pores: Red/Green/Blue")
+
+        # Give each sample its own child generator, as main.py does for its
+        # advanced stage
+        rng1, rng2, rng3 = spawn_rngs(
+            np.random.default_rng(get_config().random_seed), 3)
+
+        # Generate advanced analysis for each sample with multi-color pores;
+        # the samples are independent, so they render in parallel workers
+        run_parallel_jobs(render_advanced_sample, [
+            (diam1, intr1, 'T1', "out/T1_advanced_v3_analysis.png", rng1, 'v3'),
+            (diam2, intr2, 'T2', "out/T2_advanced_v3_analysis.png", rng2, 'v3'),
+            (diam3, intr3, 'T3', "out/T3_advanced_v3_analysis.png", rng3, 'v3')
+        ])
     else:
         print("[DEBUG] Could not load data for advanced analysis v3")
 
@@ -4,10 +4,11 @@ Special wrapper script to enforce dimension override for 40×40×160mm configura
 """
 
 import main
-from app.config import MaterialConfig, CONFIG, set_configuration
+from app.config import MaterialConfig, set_configuration
 import os
 import sys
 import importlib
+import numpy as np
 
 # Set environment variable to indicate we want dimension override
 os.environ["DIMENSION_OVERRIDE"] = "true"
@@ -16,6 +17,64 @@ os.environ["DIMENSION_OVERRIDE"] = "true"
 
 print("Applying dimension override (40×40×160mm)...")
 
+# Settings applied on top of the defaults, built once at import
+VERTICAL_BOARD_OVERRIDES = {
+    # Board dimensions - changed from 160.0 × 160.0 × 40.0
+    'board_length_mm': 40.0,
+    'board_width_mm': 40.0,
+    'board_thickness_mm': 160.0,
+
+    # Normalized coordinate scaling for the new aspect ratio: half-length and
+    # half-width reduced from 2.0, half-thickness increased from 0.5
+    'length_scale': 0.5,
+    'width_scale': 0.5,
+    'thickness_scale': 2.0,
+
+    # Aspect ratio proportional to the new dimensions: thickness/length is
+    # now 4:1, so [1, 1, 4.0] instead of [1, 1, 0.25]
+    'aspect_ratio': [1, 1, 160.0 / 40.0],
+
+    # Visualization limits for the new aspect ratio
+    'x_limits': (-0.7, 0.7),  # Adjusted from (-2.2, 2.2)
+    'y_limits': (-0.7, 0.7),  # Adjusted from (-2.2, 2.2)
+    'z_limits': (-2.2, 2.2),  # Adjusted from (-0.7, 0.7)
+
+    # Matrix fill boundaries
+    'matrix_fill_x_bounds': (-0.45, 0.45),  # Adjusted from (-1.95, 1.95)
+    'matrix_fill_y_bounds': (-0.45, 0.45),  # Adjusted from (-1.95, 1.95)
+    'matrix_fill_z_bounds': (-1.95, 1.95),  # Adjusted from (-0.45, 0.45)
+
+    # Normalization constants for particle distribution
+    'matrix_length_norm': 0.45,  # Adjusted from 1.95
+    'matrix_width_norm': 0.45,   # Adjusted from 1.95
+
+    # Default coordinate bounds for particle placement
+    'default_x_bounds': (-0.45, 0.45),  # Adjusted from (-1.95, 1.95)
+    'default_y_bounds': (-0.45, 0.45),  # Adjusted from (-1.95, 1.95)
+    'default_z_bounds': (-1.95, 1.95),  # Adjusted from (-0.45, 0.45)
+
+    # Camera rotated to emphasize the z-axis, and view angle for better
+    # vertical board visualization
+    'camera_position': np.array([1.0, 1.0, 3.0]),
+    'view_elevation': 20,
+    'view_azimuth': 30,
+
+    # Pore counts for the smaller board surface area
+    'n_pores_individual': 200,
+    'n_pores_comparative': 150,
+    'n_pores_density': 150,
+    'n_pores_matrix': 300,
+    'n_pores_hybrid': 300,
+
+    # Particle counts for the new dimensions
+    'base_particles_matrix': 10000,
+    'base_particles_hybrid_main': 5000,
+    'base_particles_hybrid_combined': 3000,
+
+    # Advanced analysis is enabled by default for this run
+    'enable_advanced_analysis': True,
+}
+
 # Store original function for reference
 original_load_default_config = MaterialConfig._load_default_config
 
@@ -27,68 +86,7 @@ def custom_40x40x160_config(self):
     original_load_default_config(self)
 
     # Then override specific dimensions and related settings
-    # X-dimension (length) - changed from 160.0
-    self.board_length_mm = 40.0
-    self.board_width_mm = 40.0       # Y-dimension (width) - changed from 160.0
-    # Z-dimension (thickness) - changed from 40.0
-    self.board_thickness_mm = 160.0
-
-    # Update normalized coordinate scaling for new aspect ratio
-    # Half-length in normalized coordinates (reduced from 2.0)
-    self.length_scale = 0.5
-    # Half-width in normalized coordinates (reduced from 2.0)
-    self.width_scale = 0.5
-    # Half-thickness in normalized coordinates (increased from 0.5)
-    self.thickness_scale = 2.0
-
-    # Update aspect ratio proportional to new dimensions
-    thickness_ratio = self.board_thickness_mm / \
-        self.board_length_mm  # Now 4:1 instead of 1:4
-    # [1, 1, 4.0] instead of [1, 1, 0.25]
-    self.aspect_ratio = [1, 1, thickness_ratio]
-
-    # Adjust visualization limits for the new aspect ratio
-    # X-axis visualization range (adjusted from -2.2, 2.2)
-    self.x_limits = (-0.7, 0.7)
-    # Y-axis visualization range (adjusted from -2.2, 2.2)
-    self.y_limits = (-0.7, 0.7)
-    # Z-axis visualization range (adjusted from -0.7, 0.7)
-    self.z_limits = (-2.2, 2.2)
-
-    # Adjust matrix fill boundaries
-    self.matrix_fill_x_bounds = (-0.45, 0.45)  # Adjusted from (-1.95, 1.95)
-    self.matrix_fill_y_bounds = (-0.45, 0.45)  # Adjusted from (-1.95, 1.95)
-    self.matrix_fill_z_bounds = (-1.95, 1.95)  # Adjusted from (-0.45, 0.45)
-
-    # Update normalization constants for particle distribution
-    self.matrix_length_norm = 0.45  # Adjusted from 1.95
-    self.matrix_width_norm = 0.45   # Adjusted from 1.95
-
-    # Adjust default coordinate bounds for particle placement
-    self.default_x_bounds = (-0.45, 0.45)  # Adjusted from (-1.95, 1.95)
-    self.default_y_bounds = (-0.45, 0.45)  # Adjusted from (-1.95, 1.95)
-    self.default_z_bounds = (-1.95, 1.95)  # Adjusted from (-0.45, 0.45)
-
-    # Update camera position for new aspect ratio
-    import numpy as np
-    # Rotated to emphasize z-axis
-    self.camera_position = np.array([1.0, 1.0, 3.0])
-
-    # Adjust view angle for better vertical board visualization
-    self.view_elevation = 20
-    self.view_azimuth = 30
-
-    # Adjust pore counts for smaller board surface area
-    self.n_pores_individual = 200
-    self.n_pores_comparative = 150
-    self.n_pores_density = 150
-    self.n_pores_matrix = 300
-    self.n_pores_hybrid = 300
-
-    # Update particle counts for the new dimensions
-    self.base_particles_matrix = 10000
-    self.base_particles_hybrid_main = 5000
-    self.base_particles_hybrid_combined = 3000
+    self.__dict__.update(VERTICAL_BOARD_OVERRIDES)
 
     # Critical fix for advanced analysis: Fix visualization parameters for advanced analysis
     if hasattr(self, 'enable_advanced_analysis') and self.enable_advanced_analysis:
@@ -126,17 +124,8 @@ def custom_40x40x160_config(self):
 # Replace the _load_default_config method with our custom implementation
 MaterialConfig._load_default_config = custom_40x40x160_config
 
-# Make sure we force a reload of the configuration with our monkey patched method
-if hasattr(CONFIG, '_config_name'):  # If CONFIG is already instantiated
-    # Create a fresh instance with our patched method
-    new_config = MaterialConfig(CONFIG._config_name)
-    # Copy the new instance attributes to the existing CONFIG
-    for attr_name in dir(new_config):
-        if not attr_name.startswith('_'):  # Skip private attributes
-            setattr(CONFIG, attr_name, getattr(new_config, attr_name))
-else:
-    # Replace CONFIG with a fresh instance
-    set_configuration("default")  # This will use our patched method
+# Force a reload of the configuration with our monkey patched method
+set_configuration("default")
 
 # Fix for get_advanced_analysis_params method to ensure proper rendering with new dimensions
 original_get_advanced_params = MaterialConfig.get_advanced_analysis_params
@@ -164,11 +153,5 @@ def enhanced_get_advanced_params(self):
 # Patch the method to return our enhanced parameters
 MaterialConfig.get_advanced_analysis_params = enhanced_get_advanced_params
 
-# Enable advanced analysis by default for this run
-CONFIG.set_advanced_analysis(True)
-
-# Import main.py from the root directory (not from app)
-
-# Execute the main function from the main module# Execute the main function (call the function, not the module)
+# Execute the main function (call the function, not the module)
 sys.exit(main.main())
-sys.exit(main())
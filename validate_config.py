@@ -8,15 +8,87 @@ by testing various parameter combinations and checking the generated configurati
 
 import sys
 import os
+import re
 import tempfile
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add app directory to path
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir / 'app'))
 
+# Scripts under test, resolved once
+CONFIG_SCRIPT = os.fspath(script_dir / "config_override.sh")
+QUICK_SCRIPT = os.fspath(script_dir / "quick_config.sh")
+
+USAGE_TEXT = """
+📚 Usage Demonstration
+==================================================
+
+1. Default Configuration Test:
+   ./config_override.sh --length 160 --width 160 --thickness 40
+   # Tests default board dimensions from config.py
+
+2. Default Pore Counts Test:
+   ./config_override.sh --pores-individual 600 --pores-comparative 400
+   # Tests default pore counts from config.py
+
+3. Small Specimen Analysis (Your Use Case):
+   ./config_override.sh --diameter 10 --tolerance 1
+   # OR using preset:
+   ./quick_config.sh small-specimen
+
+4. Default Visualization Settings Test:
+   ./config_override.sh --dpi 300 --figure-size 12,8 --elevation 30
+   # Tests default visualization parameters from config.py
+
+5. Default Pore Size Range Test:
+   ./config_override.sh --min-pore-radius 0.03 --max-pore-radius 0.08
+   # Tests default pore size range from config.py"""
+
+READY_TEXT = """🎉 Configuration override system is ready to use!
+
+Default configuration values from config.py can be tested:
+  ./config_override.sh --length 160 --width 160 --thickness 40
+  ./config_override.sh --pores-individual 600 --pores-comparative 400
+
+Your specific use case (Small specimens with 10 ± 1 mm diameter):
+  ./config_override.sh --diameter 10 --tolerance 1
+  # OR
+  ./quick_config.sh small-specimen"""
+
+
+def run_config_batch(test_cases):
+    """Run config_override.sh once for a batch of test cases, returning (output, exit code) pairs."""
+
+    # Each argument set is sent as a NUL-terminated record, one argument per line
+    payload = "".join("\n".join(test_case["args"]) + "\0"
+                      for test_case in test_cases)
+    try:
+        result = subprocess.run(
+            [CONFIG_SCRIPT, "--batch"],
+            cwd=script_dir,
+            input=payload,
+            capture_output=True,
+            text=True,
+            timeout=30 * len(test_cases)
+        )
+    except subprocess.TimeoutExpired:
+        print("❌ Batch run FAILED: Timeout")
+        return None
+
+    # Split the combined output into (output, exit code) per test case
+    parts = re.split(r"===EXIT (\d+)===\n", result.stdout)
+    runs = list(zip(parts[0::2], map(int, parts[1::2])))
+    if result.returncode != 0 or len(runs) != len(test_cases):
+        print("❌ Batch run FAILED: Script did not report every test case")
+        print(f"   stderr: {result.stderr}")
+        return None
+
+    return runs
+
 
 def test_config_override():
     """Test the configuration override functionality."""
@@ -68,52 +140,45 @@ def test_config_override():
         }
     ]
 
-    script_path = script_dir / "config_override.sh"
+    # Split the test cases into one batch per worker and run the batches
+    # concurrently; each batch still costs a single script startup
+    n_workers = min(len(test_cases), os.cpu_count() or 1)
+    batch_size = -(-len(test_cases) // n_workers)
+    batches = [test_cases[i:i + batch_size]
+               for i in range(0, len(test_cases), batch_size)]
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        batch_runs = list(executor.map(run_config_batch, batches))
 
-    # Run tests
+    if None in batch_runs:
+        return False
+    runs = [run for batch in batch_runs for run in batch]
+
+    # Check the outputs of each test
     all_passed = True
-    for i, test_case in enumerate(test_cases, 1):
+    for i, (test_case, (output, returncode)) in enumerate(zip(test_cases, runs), 1):
         print(f"\n🧪 Test {i}: {test_case['name']}")
         print("-" * 40)
 
-        try:
-            # Run the configuration script
-            result = subprocess.run(
-                [str(script_path)] + test_case["args"],
-                cwd=script_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                print(f"❌ Test failed: Script returned non-zero exit code")
-                print(f"   stderr: {result.stderr}")
-                all_passed = False
-                continue
-
-            # Check expected outputs
-            output = result.stdout
-            test_passed = True
-
-            for expected in test_case["expected_outputs"]:
-                if expected not in output:
-                    print(f"❌ Expected output not found: '{expected}'")
-                    test_passed = False
-                else:
-                    print(f"✅ Found expected output: '{expected}'")
-
-            if test_passed:
-                print(f"✅ Test {i} PASSED")
+        if returncode != 0:
+            print(f"❌ Test failed: Script returned non-zero exit code")
+            print(f"   output: {output.strip()}")
+            all_passed = False
+            continue
+
+        # Check expected outputs
+        test_passed = True
+
+        for expected in test_case["expected_outputs"]:
+            if expected not in output:
+                print(f"❌ Expected output not found: '{expected}'")
+                test_passed = False
             else:
-                print(f"❌ Test {i} FAILED")
-                all_passed = False
+                print(f"✅ Found expected output: '{expected}'")
 
-        except subprocess.TimeoutExpired:
-            print(f"❌ Test {i} FAILED: Timeout")
-            all_passed = False
-        except Exception as e:
-            print(f"❌ Test {i} FAILED: {e}")
+        if test_passed:
+            print(f"✅ Test {i} PASSED")
+        else:
+            print(f"❌ Test {i} FAILED")
             all_passed = False
 
     print("\n" + "=" * 50)
@@ -131,12 +196,10 @@ def test_quick_config():
     print("\n🚀 Testing Quick Configuration Presets")
     print("=" * 50)
 
-    quick_script = script_dir / "quick_config.sh"
-
     # Test help output
     try:
         result = subprocess.run(
-            [str(quick_script)],
+            [QUICK_SCRIPT],
             cwd=script_dir,
             capture_output=True,
             text=True,
@@ -159,30 +222,7 @@ def test_quick_config():
 
 def demonstrate_usage():
     """Demonstrate common usage patterns."""
-
-    print("\n📚 Usage Demonstration")
-    print("=" * 50)
-
-    print("\n1. Default Configuration Test:")
-    print("   ./config_override.sh --length 160 --width 160 --thickness 40")
-    print("   # Tests default board dimensions from config.py")
-
-    print("\n2. Default Pore Counts Test:")
-    print("   ./config_override.sh --pores-individual 600 --pores-comparative 400")
-    print("   # Tests default pore counts from config.py")
-
-    print("\n3. Small Specimen Analysis (Your Use Case):")
-    print("   ./config_override.sh --diameter 10 --tolerance 1")
-    print("   # OR using preset:")
-    print("   ./quick_config.sh small-specimen")
-
-    print("\n4. Default Visualization Settings Test:")
-    print("   ./config_override.sh --dpi 300 --figure-size 12,8 --elevation 30")
-    print("   # Tests default visualization parameters from config.py")
-
-    print("\n5. Default Pore Size Range Test:")
-    print("   ./config_override.sh --min-pore-radius 0.03 --max-pore-radius 0.08")
-    print("   # Tests default pore size range from config.py")
+    print(USAGE_TEXT)
 
 
 if __name__ == "__main__":
@@ -190,14 +230,11 @@ if __name__ == "__main__":
     print("=" * 60)
 
     # Check if scripts exist
-    config_script = script_dir / "config_override.sh"
-    quick_script = script_dir / "quick_config.sh"
-
-    if not config_script.exists():
+    if not os.path.exists(CONFIG_SCRIPT):
         print("❌ config_override.sh not found!")
         sys.exit(1)
 
-    if not quick_script.exists():
+    if not os.path.exists(QUICK_SCRIPT):
         print("❌ quick_config.sh not found!")
         sys.exit(1)
 
@@ -211,14 +248,7 @@ if __name__ == "__main__":
 
     print("\n" + "=" * 60)
     if success:
-        print("🎉 Configuration override system is ready to use!")
-        print("\nDefault configuration values from config.py can be tested:")
-        print("  ./config_override.sh --length 160 --width 160 --thickness 40")
-        print("  ./config_override.sh --pores-individual 600 --pores-comparative 400")
-        print("\nYour specific use case (Small specimens with 10 ± 1 mm diameter):")
-        print("  ./config_override.sh --diameter 10 --tolerance 1")
-        print("  # OR")
-        print("  ./quick_config.sh small-specimen")
+        print(READY_TEXT)
     else:
         print("❌ Configuration override system has issues that need to be resolved.")
         sys.exit(1)